@@ -1,8 +1,14 @@
 import csv
 import os
 import collections
+import html
+import json
+import heapq
+import operator
 import re
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from urllib.parse import quote
 
 # ==========================================
 # 🔧 配置区域
@@ -11,20 +17,48 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 RAW_FILE = os.path.join(BASE_DIR, 'raw_keywords.csv')
 REPORT_FILE = os.path.join(BASE_DIR, 'SEO_Dashboard.html')
 
+# 设置显示限制：虽然我们解除了限制，但为了防止浏览器崩溃，设置一个极高的安全上限 (比如 5000)
+# 如果你的数据少于 5000，就会全部显示。
+SHOW_LIMIT = 5000
+
+# 原始数据超过该行数时，关键词聚合拆分到多进程执行 (小文件进程开销大于收益)
+PARALLEL_MIN_ROWS = 500000
+
+# 意图位标记 (一个关键词可同时命中多个意图，按位或保存为整数)
+MONEY_INTENT = 1
+TRAFFIC_INTENT = 2
+COMPETITOR_INTENT = 4
+INFO_INTENT = 8
+
+# 意图显示名称 (仅用于报表展示，顺序即规则优先级)
+INTENT_NAMES = {
+    MONEY_INTENT: '💰 搞钱 (Money)',
+    TRAFFIC_INTENT: '🚦 引流 (Traffic)',
+    COMPETITOR_INTENT: '🆚 对比 (Competitor)',
+    INFO_INTENT: 'ℹ️ 其他 (Info)'
+}
+
 # 内置意图分类规则
 INTENT_RULES = {
-    '💰 搞钱 (Money)': ['price', 'buy', 'cost', 'cheap', 'discount', 'deal', 'shop', 'store', 'subscription', 'plan', '价格', '购买', '合租', '费用', '便宜', '优惠', '会员', '充值', '账号'],
-    '🚦 引流 (Traffic)': ['download', 'apk', 'install', 'error', 'fix', 'bug', 'tutorial', 'guide', 'how to', '下载', '安装', '报错', '教程', '怎么', '指南', '解决', '办法'],
-    '🆚 对比 (Competitor)': ['vs', 'alternative', 'better than', 'review', 'comparison', '对比', '替代', '好用', '评价']
+    MONEY_INTENT: ['price', 'buy', 'cost', 'cheap', 'discount', 'deal', 'shop', 'store', 'subscription', 'plan', '价格', '购买', '合租', '费用', '便宜', '优惠', '会员', '充值', '账号'],
+    TRAFFIC_INTENT: ['download', 'apk', 'install', 'error', 'fix', 'bug', 'tutorial', 'guide', 'how to', '下载', '安装', '报错', '教程', '怎么', '指南', '解决', '办法'],
+    COMPETITOR_INTENT: ['vs', 'alternative', 'better than', 'review', 'comparison', '对比', '替代', '好用', '评价']
 }
 
+# 预编译规则：每个意图的词表合并成一个正则，一次扫描完成匹配
+INTENT_PATTERNS = [
+    (intent_bit, re.compile('|'.join(re.escape(k) for k in keywords)))
+    for intent_bit, keywords in INTENT_RULES.items()
+]
+
 # 停用词表 (用于生成右侧热词榜，不影响主表格显示)
-STOP_WORDS = {
+STOP_WORDS = frozenset({
     'for', 'to', 'in', 'on', 'with', 'the', 'a', 'an', 'of', 'and', 'or', 'is', 'are', 
     'how', 'what', 'where', 'why', 'download', 'free', '2024', '2025', '2026',
     'mac', 'windows', 'linux', 'android', 'ios', 'vs', 'apk', 'mod',
     '教程', '下载', '怎么', '什么', '免费', '破解', '安装', '使用', 'cursor', 'grok', 'supergrok'
-}
+})
+WORD_RE = re.compile(r'[\w]+')
 
 # ==========================================
 # 🛠️ 核心功能函数
@@ -35,38 +69,94 @@ def load_raw_data():
     data = []
     if os.path.exists(RAW_FILE):
         try:
-            with open(RAW_FILE, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    data.append(row)
+            with open(RAW_FILE, 'r', encoding='utf-8', newline='') as f:
+                data = list(csv.DictReader(f))
         except Exception as e:
             print(f"Error reading {RAW_FILE}: {e}")
     return data
 
 def classify_keyword(keyword):
-    """对原始关键词进行实时分类"""
+    """对原始关键词进行实时分类，返回意图位掩码"""
     kw_lower = keyword.lower()
-    intents = []
-    for intent_name, keywords in INTENT_RULES.items():
-        if any(k in kw_lower for k in keywords):
-            intents.append(intent_name)
-    return intents if intents else ['ℹ️ 其他 (Info)']
-
-def calculate_heat(keyword, raw_data_list):
-    """计算热度分数 (1-5)"""
-    mentions = [r for r in raw_data_list if r['Keyword'] == keyword]
-    sources = set(r.get('Source', '') for r in mentions)
-    count = len(mentions)
-    
-    score = 1
-    if 'Google' in sources and 'Bing' in sources: score += 2
-    if count > 1: score += 1
-    if len(keyword) < 15: score += 1
-    return min(score, 5)
+    mask = 0
+    for intent_bit, pattern in INTENT_PATTERNS:
+        if pattern.search(kw_lower):
+            mask |= intent_bit
+    return mask or INFO_INTENT
+
+class KeywordRow:
+    """单个去重关键词的聚合结果 (使用 __slots__，大数据量下比 dict 更省内存)"""
+    __slots__ = ('keyword', 'sources', 'count', 'intent_mask', 'heat')
+
+    def __init__(self, keyword, count, sources):
+        self.keyword = keyword
+        self.sources = sources
+        self.count = count
+        self.intent_mask = classify_keyword(keyword)
+        self.heat = 0
+
+def calculate_heat(row):
+    """计算热度分数 (1-5)，直接使用聚合后的 sources / count"""
+    sources = row.sources
+    # 纯算术表达式：双平台 +2、多次出现 +1、短词 +1，最大值正好是 5，无需 min
+    return (1 + (('Google' in sources and 'Bing' in sources) << 1)
+            + (row.count > 1) + (len(row.keyword) < 15))
 
 def get_heat_icon(score):
     return "🔥" * score
 
+def get_display_fields(row):
+    """只为实际展示的行生成显示字段 (热度图标、转义/编码后的关键词)"""
+    return {
+        'HeatIcon': get_heat_icon(row.heat),
+        'KeywordHtml': html.escape(row.keyword),
+        'KeywordQ': quote(row.keyword)
+    }
+
+def get_row_data(row):
+    """主表行数据 (JSON 下发给前端渲染): [热度, 关键词, 来源, 分类]"""
+    return [
+        row.heat,
+        row.keyword,
+        " + ".join(row.sources),
+        # 主表只显示优先级最高 (最低位) 的意图
+        INTENT_NAMES[row.intent_mask & -row.intent_mask]
+    ]
+
+def aggregate_chunk(pairs):
+    """聚合一段 (关键词, 来源) 数据，返回 {关键词: [次数, 来源集合]} (保持首次出现顺序)"""
+    agg = {}
+    for kw, src in pairs:
+        slot = agg.get(kw)
+        if slot is None:
+            agg[kw] = [1, {src}]
+        else:
+            slot[0] += 1
+            slot[1].add(src)
+    return agg
+
+def aggregate_keywords(data):
+    """关键词聚合：大数据量时按块分给多个进程，再按块顺序合并"""
+    pairs = [(r['Keyword'], r.get('Source', 'Unknown')) for r in data]
+    if len(pairs) < PARALLEL_MIN_ROWS:
+        return aggregate_chunk(pairs)
+
+    workers = os.cpu_count() or 1
+    chunk_size = -(-len(pairs) // workers)
+    chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+
+    merged = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for part in executor.map(aggregate_chunk, chunks):
+            for kw, (count, sources) in part.items():
+                slot = merged.get(kw)
+                if slot is None:
+                    merged[kw] = [count, sources]
+                else:
+                    slot[0] += count
+                    slot[1] |= sources
+    return merged
+
 def analyze_raw_data(data):
     """全量分析原始数据"""
     
@@ -74,89 +164,126 @@ def analyze_raw_data(data):
     total_raw = len(data)
     sources_count = collections.Counter(r.get('Source', 'Unknown') for r in data)
     
-    # 2. 关键词聚合与热度计算
-    unique_keywords = {}
+    # 2. 关键词聚合
+    processed_list = [
+        KeywordRow(kw, count, sources)
+        for kw, (count, sources) in aggregate_keywords(data).items()
+    ]
     intent_stats = collections.Counter()
-    
-    for row in data:
-        kw = row['Keyword']
-        if kw not in unique_keywords:
-            unique_keywords[kw] = {
-                'Keyword': kw,
-                'Sources': set(),
-                'Count': 0,
-                'Intent': classify_keyword(kw)
-            }
-        unique_keywords[kw]['Sources'].add(row.get('Source', 'Unknown'))
-        unique_keywords[kw]['Count'] += 1
-
-    # 3. 处理列表
-    processed_list = []
-    for kw, info in unique_keywords.items():
-        score = calculate_heat(kw, data)
-        info['HeatScore'] = score
-        info['HeatIcon'] = get_heat_icon(score)
-        info['SourceDisplay'] = " + ".join(info['Sources'])
-        processed_list.append(info)
+
+    # 3. 热度计算
+    for row in processed_list:
+        row.heat = calculate_heat(row)
         
         # 统计意图（用于图表）
-        for intent in info['Intent']:
-            intent_stats[intent] += 1
+        for intent_bit, intent_name in INTENT_NAMES.items():
+            if row.intent_mask & intent_bit:
+                intent_stats[intent_name] += 1
+
+    # 按意图分组 (一次遍历，位运算判断)
+    money_keywords = []
+    traffic_keywords = []
+    for x in processed_list:
+        if x.intent_mask & MONEY_INTENT:
+            money_keywords.append(x)
+        if x.intent_mask & TRAFFIC_INTENT:
+            traffic_keywords.append(x)
 
-    # 4. 排序 (按热度降序)
-    processed_list.sort(key=lambda x: x['HeatScore'], reverse=True)
+    # 4. 按热度取 Top-N (报表只展示前 N 条，不对全量排序)
+    # nlargest 是稳定的，结果与 sorted(..., reverse=True)[:n] 一致
+    by_heat = operator.attrgetter('heat')
+    money_top = heapq.nlargest(10, money_keywords, key=by_heat)
+    traffic_top = heapq.nlargest(10, traffic_keywords, key=by_heat)
+    top_keywords = heapq.nlargest(SHOW_LIMIT, processed_list, key=by_heat)
 
     # 5. 词频统计
-    all_text = " ".join([d['Keyword'].lower() for d in data])
-    words = re.findall(r'[\w]+', all_text)
-    clean_words = [w for w in words if w not in STOP_WORDS and len(w) > 1 and not w.isdigit()]
-    word_freq = collections.Counter(clean_words).most_common(20)
+    word_counter = collections.Counter()
+    for d in data:
+        word_counter.update(
+            w for w in WORD_RE.findall(d['Keyword'].lower())
+            if w not in STOP_WORDS and len(w) > 1 and not w.isdigit()
+        )
+    word_freq = word_counter.most_common(20)
     
     # 6. 打包数据
     analysis = {
         'total_raw': total_raw,
         'unique_total': len(processed_list),
-        'high_heat_count': sum(1 for x in processed_list if x['HeatScore'] >= 4),
+        'high_heat_count': sum(1 for x in processed_list if x.heat >= 4),
         'sources_stats': dict(sources_count),
         'intent_stats': dict(intent_stats),
         'word_freq': word_freq,
-        'money_keywords': [x for x in processed_list if any('搞钱' in i for i in x['Intent'])],
-        'traffic_keywords': [x for x in processed_list if any('引流' in i for i in x['Intent'])],
-        'all_keywords': processed_list # 这里保留全量数据
+        'money_keywords': money_keywords,
+        'traffic_keywords': traffic_keywords,
+        'money_top': money_top,
+        'traffic_top': traffic_top,
+        'top_keywords': top_keywords, # 主表展示用 (已按热度降序)
+        'all_keywords': processed_list # 这里保留全量数据 (未排序)
     }
     
     return analysis
 
-def generate_html(analysis):
-    """生成全能版仪表盘 (无限制版)"""
-    
-    # 准备图表数据
-    freq_labels = [x[0] for x in analysis['word_freq']]
-    freq_values = [x[1] for x in analysis['word_freq']]
-    
-    intent_labels = list(analysis['intent_stats'].keys())
-    intent_values = list(analysis['intent_stats'].values())
-    
-    source_labels = list(analysis['sources_stats'].keys())
-    source_values = list(analysis['sources_stats'].values())
+# ==========================================
+# 🧩 HTML 行模板 (str.format，逐行写入文件；填入的文本字段均已做 HTML 转义)
+# ==========================================
 
-    # 热词列表HTML
-    top_roots_html = ""
-    for word, count in analysis['word_freq']:
-        top_roots_html += f"""
+TOP_ROOT_TEMPLATE = """
         <button class="list-group-item list-group-item-action d-flex justify-content-between align-items-center" 
                 onclick="filterTable('{word}')">
-            <span class="fw-bold">{word}</span>
+            <span class="fw-bold">{word_html}</span>
             <span class="badge bg-light text-dark">{count}</span>
         </button>
         """
-        
-    # 设置显示限制：虽然我们解除了限制，但为了防止浏览器崩溃，设置一个极高的安全上限 (比如 5000)
-    # 如果你的数据少于 5000，就会全部显示。
-    SHOW_LIMIT = 5000 
-    display_keywords = analysis['all_keywords'][:SHOW_LIMIT]
 
-    html = f"""
+MONEY_ROW_TEMPLATE = """
+                            <tr>
+                                <td class="heat-icon">{HeatIcon}</td>
+                                <td class="fw-bold">{KeywordHtml}</td>
+                                <td class="text-end">
+                                    <a href="https://www.xiaohongshu.com/search_result?keyword={KeywordQ}" target="_blank" class="search-btn xhs-color"><i class="fas fa-book"></i></a>
+                                    <a href="https://www.zhihu.com/search?type=content&q={KeywordQ}" target="_blank" class="search-btn zhihu-color"><i class="fas fa-brain"></i></a>
+                                </td>
+                            </tr>
+                            """
+
+TRAFFIC_ROW_TEMPLATE = """
+                            <tr>
+                                <td class="heat-icon">{HeatIcon}</td>
+                                <td>{KeywordHtml}</td>
+                                <td class="text-end">
+                                    <a href="https://www.xiaohongshu.com/search_result?keyword={KeywordQ}" target="_blank" class="search-btn xhs-color"><i class="fas fa-book"></i></a>
+                                    <a href="https://www.zhihu.com/search?type=content&q={KeywordQ}" target="_blank" class="search-btn zhihu-color"><i class="fas fa-brain"></i></a>
+                                </td>
+                            </tr>
+                            """
+
+def generate_html(analysis):
+    """生成全能版仪表盘 (无限制版)，静态片段与表格行直接流式写入文件"""
+    
+    # 准备图表数据 (以 JSON 数据岛嵌入页面，前端 JSON.parse 读取)
+    chart_data = {
+        'freq': {
+            'labels': [x[0] for x in analysis['word_freq']],
+            'values': [x[1] for x in analysis['word_freq']]
+        },
+        'intent': {
+            'labels': list(analysis['intent_stats'].keys()),
+            'values': list(analysis['intent_stats'].values())
+        },
+        'source': {
+            'labels': list(analysis['sources_stats'].keys()),
+            'values': list(analysis['sources_stats'].values())
+        }
+    }
+    # 转义 "</" 防止数据中的 </script> 提前闭合标签
+    chart_json = json.dumps(chart_data, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+    # 主表只展示热度 Top-N，数据以 JSON 下发，由前端按可视区域渲染 (虚拟滚动)
+    display_keywords = analysis['top_keywords']
+    rows_json = json.dumps([get_row_data(r) for r in display_keywords], ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        f.write(f"""
 <!DOCTYPE html>
 <html lang="zh-CN">
 <head>
@@ -260,16 +387,9 @@ def generate_html(analysis):
                     <table class="table table-hover align-middle mb-0 text-nowrap">
                         <thead class="table-light"><tr><th>热度</th><th>关键词</th><th class="text-end">调研</th></tr></thead>
                         <tbody>
-                            {"".join([f'''
-                            <tr>
-                                <td class="heat-icon">{r['HeatIcon']}</td>
-                                <td class="fw-bold">{r['Keyword']}</td>
-                                <td class="text-end">
-                                    <a href="https://www.xiaohongshu.com/search_result?keyword={r['Keyword']}" target="_blank" class="search-btn xhs-color"><i class="fas fa-book"></i></a>
-                                    <a href="https://www.zhihu.com/search?type=content&q={r['Keyword']}" target="_blank" class="search-btn zhihu-color"><i class="fas fa-brain"></i></a>
-                                </td>
-                            </tr>
-                            ''' for r in analysis['money_keywords'][:10]])}
+                            """)
+        f.writelines(MONEY_ROW_TEMPLATE.format(**get_display_fields(r)) for r in analysis['money_top'])
+        f.write(f"""
                         </tbody>
                     </table>
                 </div>
@@ -282,16 +402,9 @@ def generate_html(analysis):
                     <table class="table table-hover align-middle mb-0 text-nowrap">
                         <thead class="table-light"><tr><th>热度</th><th>关键词</th><th class="text-end">调研</th></tr></thead>
                         <tbody>
-                            {"".join([f'''
-                            <tr>
-                                <td class="heat-icon">{r['HeatIcon']}</td>
-                                <td>{r['Keyword']}</td>
-                                <td class="text-end">
-                                    <a href="https://www.xiaohongshu.com/search_result?keyword={r['Keyword']}" target="_blank" class="search-btn xhs-color"><i class="fas fa-book"></i></a>
-                                    <a href="https://www.zhihu.com/search?type=content&q={r['Keyword']}" target="_blank" class="search-btn zhihu-color"><i class="fas fa-brain"></i></a>
-                                </td>
-                            </tr>
-                            ''' for r in analysis['traffic_keywords'][:10]])}
+                            """)
+        f.writelines(TRAFFIC_ROW_TEMPLATE.format(**get_display_fields(r)) for r in analysis['traffic_top'])
+        f.write(f"""
                         </tbody>
                     </table>
                 </div>
@@ -308,8 +421,8 @@ def generate_html(analysis):
                     <input type="text" id="tableSearch" class="form-control form-control-sm w-25" placeholder="🔍 搜索...">
                 </div>
                 <div class="card-body p-0">
-                    <div class="table-responsive" style="max-height: 800px; overflow-y: auto;">
-                        <table class="table table-sm table-hover align-middle mb-0" id="mainTable">
+                    <div class="table-responsive" id="mainTableWrap" style="max-height: 800px; overflow-y: auto;">
+                        <table class="table table-sm table-hover align-middle mb-0 text-nowrap" id="mainTable">
                             <thead class="table-light sticky-top">
                                 <tr>
                                     <th width="80">热度</th>
@@ -319,22 +432,10 @@ def generate_html(analysis):
                                     <th class="text-end">调研</th>
                                 </tr>
                             </thead>
-                            <tbody>
-                                {"".join([f'''
-                                <tr>
-                                    <td class="heat-icon">{r['HeatIcon']}</td>
-                                    <td>{r['Keyword']}</td>
-                                    <td><span class="badge bg-light text-dark border badge-source">{r['SourceDisplay']}</span></td>
-                                    <td><span class="badge bg-secondary badge-source">{r['Intent'][0]}</span></td>
-                                    <td class="text-end">
-                                        <a href="https://www.xiaohongshu.com/search_result?keyword={r['Keyword']}" target="_blank" class="search-btn xhs-color"><i class="fas fa-book"></i></a>
-                                    </td>
-                                </tr>
-                                ''' for r in display_keywords])} 
-                            </tbody>
+                            <tbody id="mainTableBody"></tbody>
                         </table>
                         <div class="p-2 text-center text-muted small">
-                            当前展示了 {len(display_keywords)} 条数据 (Total Available: {analysis['unique_total']})
+                            当前展示了 <span id="matchCount">{len(display_keywords)}</span> 条数据 (Total Available: {analysis['unique_total']})
                         </div>
                     </div>
                 </div>
@@ -345,7 +446,10 @@ def generate_html(analysis):
                 <div class="card-header bg-white border-0 fw-bold small">📌 点击筛选热词</div>
                 <div class="card-body p-0" style="max-height: 800px; overflow-y: auto;">
                     <div class="list-group list-group-flush small">
-                        {top_roots_html}
+                        """)
+        # 热词列表
+        f.writelines(TOP_ROOT_TEMPLATE.format(word=word, word_html=html.escape(word), count=count) for word, count in analysis['word_freq'])
+        f.write(f"""
                     </div>
                 </div>
             </div>
@@ -354,52 +458,101 @@ def generate_html(analysis):
 
 </div>
 
+<script id="chartData" type="application/json">{chart_json}</script>
+<script id="rowsData" type="application/json">{rows_json}</script>
 <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
 <script>
     // Charts Config
+    const chartData = JSON.parse(document.getElementById('chartData').textContent);
+
     new Chart(document.getElementById('freqChart'), {{
         type: 'bar',
-        data: {{ labels: {freq_labels}, datasets: [{{ label: '提及频次', data: {freq_values}, backgroundColor: '#6c5ce7', borderRadius: 4 }}] }},
+        data: {{ labels: chartData.freq.labels, datasets: [{{ label: '提及频次', data: chartData.freq.values, backgroundColor: '#6c5ce7', borderRadius: 4 }}] }},
         options: {{ responsive: true, maintainAspectRatio: false, plugins: {{ legend: {{ display: false }} }} }}
     }});
 
     new Chart(document.getElementById('intentChart'), {{
         type: 'doughnut',
-        data: {{ labels: {intent_labels}, datasets: [{{ data: {intent_values}, backgroundColor: ['#00b894', '#0984e3', '#636e72', '#fdcb6e'] }}] }},
+        data: {{ labels: chartData.intent.labels, datasets: [{{ data: chartData.intent.values, backgroundColor: ['#00b894', '#0984e3', '#636e72', '#fdcb6e'] }}] }},
         options: {{ responsive: true, maintainAspectRatio: false, cutout: '65%', plugins: {{ legend: {{ position: 'right' }} }} }}
     }});
 
     new Chart(document.getElementById('sourceChart'), {{
         type: 'pie',
-        data: {{ labels: {source_labels}, datasets: [{{ data: {source_values}, backgroundColor: ['#4285F4', '#00a4ef', '#EA4335'] }}] }},
+        data: {{ labels: chartData.source.labels, datasets: [{{ data: chartData.source.values, backgroundColor: ['#4285F4', '#00a4ef', '#EA4335'] }}] }},
         options: {{ responsive: true, maintainAspectRatio: false, plugins: {{ legend: {{ position: 'bottom' }} }} }}
     }});
 
-    // Filter Logic
+    // Main Table: rows ship as JSON and only the rows inside the scroll viewport are in the DOM
+    const rowsData = JSON.parse(document.getElementById('rowsData').textContent);
+    const lowerKeywords = rowsData.map(r => r[1].toLowerCase());
     const searchInput = document.getElementById('tableSearch');
     const table = document.getElementById('mainTable');
-    const trs = table.getElementsByTagName('tr');
+    const tableWrap = document.getElementById('mainTableWrap');
+    const tbody = document.getElementById('mainTableBody');
+    const matchCount = document.getElementById('matchCount');
+    const BUFFER_ROWS = 20;
+    let rowHeight = 33;
+    let view = rowsData.map((_, i) => i);
 
+    function esc(s) {{
+        return String(s).replace(/[&<>"']/g, c => ({{'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'}})[c]);
+    }}
+
+    function rowHtml(r) {{
+        return '<tr><td class="heat-icon">' + '🔥'.repeat(r[0]) + '</td>' +
+            '<td>' + esc(r[1]) + '</td>' +
+            '<td><span class="badge bg-light text-dark border badge-source">' + esc(r[2]) + '</span></td>' +
+            '<td><span class="badge bg-secondary badge-source">' + esc(r[3]) + '</span></td>' +
+            '<td class="text-end"><a href="https://www.xiaohongshu.com/search_result?keyword=' + encodeURIComponent(r[1]) +
+            '" target="_blank" class="search-btn xhs-color"><i class="fas fa-book"></i></a></td></tr>';
+    }}
+
+    function spacerHtml(height) {{
+        return height > 0 ? '<tr aria-hidden="true"><td colspan="5" class="p-0 border-0" style="height:' + height + 'px"></td></tr>' : '';
+    }}
+
+    function renderRows() {{
+        const start = Math.max(0, Math.floor(tableWrap.scrollTop / rowHeight) - BUFFER_ROWS);
+        const end = Math.min(view.length, start + Math.ceil(tableWrap.clientHeight / rowHeight) + 2 * BUFFER_ROWS);
+        let out = spacerHtml(start * rowHeight);
+        for (let i = start; i < end; i++) out += rowHtml(rowsData[view[i]]);
+        tbody.innerHTML = out + spacerHtml((view.length - end) * rowHeight);
+    }}
+
+    let renderPending = false;
+    tableWrap.addEventListener('scroll', function() {{
+        if (renderPending) return;
+        renderPending = true;
+        requestAnimationFrame(function() {{ renderPending = false; renderRows(); }});
+    }});
+
+    // Filter Logic
     function filterTable(query) {{
         searchInput.value = query;
         const filter = query.toLowerCase();
-        for (let i = 1; i < trs.length; i++) {{
-            const td = trs[i].getElementsByTagName('td')[1];
-            if (td) {{
-                const txtValue = td.textContent || td.innerText;
-                trs[i].style.display = txtValue.toLowerCase().indexOf(filter) > -1 ? "" : "none";
-            }}
+        view = [];
+        for (let i = 0; i < lowerKeywords.length; i++) {{
+            if (lowerKeywords[i].indexOf(filter) > -1) view.push(i);
         }}
+        matchCount.textContent = view.length;
+        tableWrap.scrollTop = 0;
+        renderRows();
         table.scrollIntoView({{behavior: "smooth"}});
     }}
     searchInput.addEventListener('keyup', function() {{ filterTable(this.value); }});
+
+    // First paint, then re-render with the measured row height
+    renderRows();
+    const firstRow = tbody.querySelector('tr:not([aria-hidden])');
+    if (firstRow && firstRow.offsetHeight) {{
+        rowHeight = firstRow.offsetHeight;
+        renderRows();
+    }}
 </script>
 </body>
 </html>
-    """
-    
-    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
-        f.write(html)
+    """)
     print(f"✅ Dashboard generated successfully: {REPORT_FILE}")
 
 def main():
@@ -1,5 +1,6 @@
 import csv
 import os
+import re
 import sys
 
 # Configuration Files
@@ -16,6 +17,35 @@ INTENT_RULES = {
     'Guide': ['how to', 'tutorial', 'guide', 'steps', 'learn', 'course', 'example', 'tips', '教程', '怎么', '指南', '学习', '示例', '技巧', '方法']
 }
 
+def _trie_to_regex(node):
+    """Turns a character trie into a prefix-factored regex fragment"""
+    if '' in node:
+        # A shorter term already ends here; longer ones can't change a search() hit
+        return ''
+    alternatives = [re.escape(ch) + _trie_to_regex(child) for ch, child in node.items()]
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return '(?:' + '|'.join(alternatives) + ')'
+
+def compile_terms(terms):
+    """Compiles a list of literal terms into one regex (None if empty).
+
+    Terms are merged into a trie first so shared prefixes are matched once,
+    instead of the engine retrying every term at every position.
+    """
+    if not terms:
+        return None
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[''] = True
+    return re.compile(_trie_to_regex(trie))
+
+# Precompiled intent patterns, one search per category instead of one per term
+INTENT_PATTERNS = [(intent, compile_terms(terms)) for intent, terms in INTENT_RULES.items()]
+
 def load_blacklist():
     """Reads blacklist words from blacklist.txt"""
     if not os.path.exists(BLACKLIST_FILE):
@@ -34,26 +64,18 @@ def load_blacklist():
 def classify_intent(keyword):
     """Classifies keyword based on generic rules"""
     keyword_lower = keyword.lower()
-    intents = []
-    
-    for intent, terms in INTENT_RULES.items():
-        for term in terms:
-            if term in keyword_lower:
-                intents.append(intent)
-                break # One match per category is enough
+    intents = [intent for intent, pattern in INTENT_PATTERNS if pattern.search(keyword_lower)]
     
     if not intents:
         return 'Informational' # Default fallback
     
     return ', '.join(intents)
 
-def is_blacklisted(keyword, blacklist):
+def is_blacklisted(keyword, blacklist_pattern):
     """Checks if keyword contains any blacklisted term"""
-    keyword_lower = keyword.lower()
-    for term in blacklist:
-        if term in keyword_lower:
-            return True
-    return False
+    if blacklist_pattern is None:
+        return False
+    return blacklist_pattern.search(keyword.lower()) is not None
 
 def main():
     print("Starting Cleaner...")
@@ -66,14 +88,20 @@ def main():
     blacklist = load_blacklist()
     if not blacklist and os.path.exists(BLACKLIST_FILE):
         print("Warning: Blacklist is empty.")
+    blacklist_pattern = compile_terms(blacklist)
 
     processed_count = 0
     filtered_count = 0
+    saved_count = 0
     
-    final_tasks = []
+    # Rows are streamed into a temp file and only moved over OUTPUT_FILE
+    # once the whole input has been processed successfully.
+    fieldnames = ['Keyword', 'Intent', 'Source', 'Seed']
+    temp_file = OUTPUT_FILE + '.tmp'
 
     try:
-        with open(INPUT_FILE, 'r', encoding='utf-8') as f:
+        with open(INPUT_FILE, 'r', encoding='utf-8', newline='') as f, \
+             open(temp_file, 'w', newline='', encoding='utf-8') as out:
             reader = csv.DictReader(f)
             
             # Check if CSV has data
@@ -81,6 +109,9 @@ def main():
                 print("Error: Input CSV is empty or invalid.")
                 return
 
+            writer = csv.DictWriter(out, fieldnames=fieldnames)
+            writer.writeheader()
+
             for row in reader:
                 keyword = row.get('Keyword', '').strip()
                 if not keyword:
@@ -88,43 +119,34 @@ def main():
                 
                 processed_count += 1
                 
-                if is_blacklisted(keyword, blacklist):
+                if is_blacklisted(keyword, blacklist_pattern):
                     filtered_count += 1
                     continue
                 
-                intent = classify_intent(keyword)
-                
-                # Create new row with classification
-                new_row = {
+                # Write new row with classification
+                writer.writerow({
                     'Keyword': keyword,
-                    'Intent': intent,
+                    'Intent': classify_intent(keyword),
                     'Source': row.get('Source', 'Unknown'),
                     'Seed': row.get('Seed', '')
-                }
-                final_tasks.append(new_row)
-                
-    except Exception as e:
-        print(f"Error reading {INPUT_FILE}: {e}")
-        return
+                })
+                saved_count += 1
 
-    # Write results
-    try:
-        if final_tasks:
-            fieldnames = ['Keyword', 'Intent', 'Source', 'Seed']
-            with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(final_tasks)
+        if saved_count:
+            os.replace(temp_file, OUTPUT_FILE)
             
             print(f"Processing complete.")
             print(f"Total processed: {processed_count}")
             print(f"Filtered (Blacklist): {filtered_count}")
-            print(f"Saved to {OUTPUT_FILE}: {len(final_tasks)}")
+            print(f"Saved to {OUTPUT_FILE}: {saved_count}")
         else:
             print("No valid keywords found after filtering.")
-            
+                
     except Exception as e:
-        print(f"Error saving to {OUTPUT_FILE}: {e}")
+        print(f"Error processing {INPUT_FILE} -> {OUTPUT_FILE}: {e}")
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
 
 if __name__ == "__main__":
     main()
@@ -13,12 +13,12 @@ import sys
 import time
 import requests
 import json
-import random
 import string
 import re
+import threading
+from urllib.parse import urlsplit
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
-from collections import defaultdict
 
 # ==========================================
 # 🔧 配置区域
@@ -28,21 +28,54 @@ SEEDS_FILE = os.path.join(BASE_DIR, 'seeds.txt')
 OUTPUT_FILE = os.path.join(BASE_DIR, 'raw_keywords.csv')
 
 MAX_WORKERS = 8
-DELAY_MIN = 0.5
-DELAY_MAX = 1.0
+RATE_PER_HOST = 8  # 每个域名每秒最多请求数 (Google / Bing 各自独立计数)
 
 USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
 ]
 
+# 汉字检测 (模块加载时编译一次)
+CHINESE_RE = re.compile(r'[\u4e00-\u9fa5]')
+
+def make_session(user_agent):
+    """共享 Session：线程池内复用 keep-alive 连接，UA 固定在 Session 的默认请求头里"""
+    session = requests.Session()
+    session.headers['User-Agent'] = user_agent
+    adapter = requests.adapters.HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS * 2)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+# 每个 UA 一个预先建好的 Session，按任务序号轮换 (不再每个请求 random.choice)
+SESSIONS = [make_session(ua) for ua in USER_AGENTS]
+
+class RateLimiter:
+    """按域名限速：每个域名按固定间隔发放请求时间片，线程只在自己的域名排队"""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next_slot = {}
+
+    def acquire(self, host):
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.interval
+        # 锁外等待，不阻塞其他域名的线程
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+
+RATE_LIMITER = RateLimiter(RATE_PER_HOST)
+
 # ==========================================
 # 🛠️ 核心功能
 # ==========================================
 
 def contains_chinese(text):
     """检查是否包含汉字"""
-    return bool(re.search(r'[\u4e00-\u9fa5]', text))
+    return CHINESE_RE.search(text) is not None
 
 def load_seeds():
     if not os.path.exists(SEEDS_FILE): return []
@@ -50,11 +83,10 @@ def load_seeds():
         seeds = [line.strip() for line in f if line.strip()]
     return seeds
 
-def get_suggestions(url, params, source_name):
+def get_suggestions(session, url, params, source_name):
     try:
-        headers = {'User-Agent': random.choice(USER_AGENTS)}
-        time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
-        response = requests.get(url, params=params, headers=headers, timeout=5)
+        RATE_LIMITER.acquire(urlsplit(url).hostname)
+        response = session.get(url, params=params, timeout=5)
         if response.status_code == 200:
             if source_name == 'Google':
                 data = response.json()
@@ -67,36 +99,35 @@ def get_suggestions(url, params, source_name):
         pass
     return []
 
-def mine_google(query):
+def mine_google(session, query):
     # 保持全球中文环境
     url = "http://suggestqueries.google.com/complete/search"
     params = {'client': 'chrome', 'q': query, 'hl': 'zh-CN', 'ds': ''}
-    return get_suggestions(url, params, 'Google')
+    return get_suggestions(session, url, params, 'Google')
 
-def mine_bing(query):
+def mine_bing(session, query):
     url = "https://api.bing.com/osjson.aspx"
     params = {'query': query, 'mkt': 'zh-CN'}
-    return get_suggestions(url, params, 'Bing')
+    return get_suggestions(session, url, params, 'Bing')
+
+# 渠道位标记 (Google + Bing 共同推荐 = ALL_SOURCES)
+SOURCE_BITS = {'Google': 1, 'Bing': 2}
+ALL_SOURCES = 3
 
-def mine_single_task(task):
+# 渠道 -> 挖掘函数 (每个渠道单独提交到线程池，Google 与 Bing 的请求可以并行)
+MINERS = {
+    'Google': mine_google,
+    'Bing': mine_bing,
+}
+
+def mine_single_task(index, task, source):
     """
     注意：这里不再做过滤，而是先把所有东西都挖回来。
     筛选逻辑放到最后统一处理，因为我们需要对比 Google 和 Bing 的结果。
     """
     query, seed = task
-    results = []
-    
-    # 挖 Google
-    g_results = mine_google(query)
-    for kw in g_results:
-        results.append({'kw': kw, 'source': 'Google', 'seed': seed})
-        
-    # 挖 Bing
-    b_results = mine_bing(query)
-    for kw in b_results:
-        results.append({'kw': kw, 'source': 'Bing', 'seed': seed})
-        
-    return results
+    session = SESSIONS[index % len(SESSIONS)]
+    return [{'kw': kw, 'source': source, 'seed': seed} for kw in MINERS[source](session, query)]
 
 def get_suffixes():
     suffixes = list(string.ascii_lowercase)
@@ -119,70 +150,81 @@ def main():
         for suffix in suffixes:
             tasks.append((f"{seed} {suffix}", seed))
             
-    print(f"📋 任务数: {len(tasks)}")
+    # 每个 (查询, 渠道) 组合是一个独立请求
+    jobs = [(i, task, source) for i, task in enumerate(tasks) for source in MINERS]
+    print(f"📋 任务数: {len(tasks)} (请求数: {len(jobs)})")
     
     # 2. 临时存储所有数据 (用于对比)
-    # 格式: { "关键词": { "sources": {"Google", "Bing"}, "seed": "xxx" } }
-    temp_storage = defaultdict(lambda: {'sources': set(), 'seed': ''})
+    # 格式: { "关键词": [渠道位掩码, "种子"] }
+    temp_storage = {}
     
     print("⏳ 正在全面挖掘 (先采集，后清洗)...")
     
-    with tqdm(total=len(tasks), desc="Mining", unit="task", ncols=100) as pbar:
+    with tqdm(total=len(jobs), desc="Mining", unit="req", ncols=100) as pbar:
         with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_to_task = {executor.submit(mine_single_task, task): task for task in tasks}
+            future_to_job = {executor.submit(mine_single_task, *job): job for job in jobs}
             
-            for future in as_completed(future_to_task):
+            for future in as_completed(future_to_job):
                 try:
                     results = future.result()
                     if results:
                         for item in results:
                             kw = item['kw']
-                            src = item['source']
-                            # 记录数据
-                            temp_storage[kw]['sources'].add(src)
-                            # 记录来源种子 (保留第一个遇到的即可)
-                            if not temp_storage[kw]['seed']:
-                                temp_storage[kw]['seed'] = item['seed']
+                            bit = SOURCE_BITS[item['source']]
+                            slot = temp_storage.get(kw)
+                            if slot is None:
+                                # 记录数据 + 来源种子 (保留第一个遇到的即可)
+                                temp_storage[kw] = [bit, item['seed']]
+                            else:
+                                slot[0] |= bit
                     pbar.update(1)
                 except:
                     pbar.update(1)
 
-    # 3. 核心清洗逻辑 (Smart Filtering)
+    # 3. 核心清洗逻辑 (Smart Filtering) + 4. 边清洗边保存
     print(f"\n🧹 正在清洗数据 (原始数据量: {len(temp_storage)})...")
-    final_keywords = []
-    
-    for kw, data in temp_storage.items():
-        sources = data['sources']
-        seed = data['seed']
-        
-        # --- 你的核心策略 ---
-        is_chinese = contains_chinese(kw)
-        is_consensus = ('Google' in sources and 'Bing' in sources) # 两个都有
-        
-        should_keep = False
-        
-        if is_chinese:
-            should_keep = True # 中文直接留
-        elif is_consensus:
-            should_keep = True # 英文如果双平台推荐，说明是热词，留！
-        
-        if should_keep:
-            # 存入列表，展平来源 (如果两个都有，就存两条记录，方便 Analyzer 统计热度)
-            for src in sources:
-                final_keywords.append([kw, src, seed])
-
-    print(f"✨ 清洗完成！保留了 {len(final_keywords)} 条【高价值】数据")
-    print(f"🗑️  丢弃了 {len(temp_storage) - len(set(x[0] for x in final_keywords))} 条【单平台英文噪音】")
-
-    # 4. 保存
-    if final_keywords:
-        with open(OUTPUT_FILE, 'w', newline='', encoding='utf-8') as f:
+    # 先写临时文件，有数据时再替换，避免空结果覆盖上一次的 raw_keywords.csv
+    temp_file = OUTPUT_FILE + '.tmp'
+    saved_rows = 0
+    kept_keywords = 0
+
+    try:
+        with open(temp_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
             writer = csv.writer(f)
             writer.writerow(['Keyword', 'Source', 'Seed'])
-            writer.writerows(final_keywords)
-        print(f"✅ 结果已保存至: {OUTPUT_FILE}")
-    else:
-        print("⚠️ 未保留任何数据")
+
+            for kw, (mask, seed) in temp_storage.items():
+
+                # --- 你的核心策略 ---
+                is_chinese = contains_chinese(kw)
+                is_consensus = (mask == ALL_SOURCES) # 两个都有
+
+                should_keep = False
+
+                if is_chinese:
+                    should_keep = True # 中文直接留
+                elif is_consensus:
+                    should_keep = True # 英文如果双平台推荐，说明是热词，留！
+
+                if should_keep:
+                    kept_keywords += 1
+                    # 直接写入，展平来源 (如果两个都有，就存两条记录，方便 Analyzer 统计热度)
+                    for src, bit in SOURCE_BITS.items():
+                        if mask & bit:
+                            writer.writerow([kw, src, seed])
+                            saved_rows += 1
+
+        print(f"✨ 清洗完成！保留了 {saved_rows} 条【高价值】数据")
+        print(f"🗑️  丢弃了 {len(temp_storage) - kept_keywords} 条【单平台英文噪音】")
+
+        if saved_rows:
+            os.replace(temp_file, OUTPUT_FILE)
+            print(f"✅ 结果已保存至: {OUTPUT_FILE}")
+        else:
+            print("⚠️ 未保留任何数据")
+    finally:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,39 +1,136 @@
 import os
 import sys
 import re
+import functools
+import posixpath
+import socket
+import time
 import concurrent.futures
 import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urlparse, urljoin, unquote
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+from urllib.parse import urlparse, urljoin, unquote, urlsplit, urlunsplit
 from colorama import init, Fore, Style
-from collections import defaultdict
+from collections import Counter, defaultdict
 
 # Initialize colorama
 init(autoreset=True)
 
+# Prefer the lxml C parser; fall back to the built-in one if it isn't installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
 # --- Configuration & Constants ---
 
 IGNORE_PATHS = {'.git', 'node_modules', '__pycache__', '.vscode', '.idea', 'venv', 'env', 'MasterTool'}
 IGNORE_URL_PREFIXES = ('/go/', 'cdn-cgi', 'javascript:', 'mailto:', 'tel:', '#')
 IGNORE_FILES = {'google', '404.html'} # Filenames containing these strings
+BREADCRUMB_RE = re.compile("breadcrumb", re.I)
+# Same answer as bool(urlparse(url).netloc): optional scheme, then "//" and a non-empty host
+EXTERNAL_URL_RE = re.compile(r'[\x00-\x20]*(?:[a-zA-Z][a-zA-Z0-9+.-]*:)?//[^/?#]')
+MAX_STORED_ISSUES = 10000 # Messages kept per list; totals are still counted past this
+PATH_INTERN_MAX = 50000 # Interned URL paths kept before the table is reset
+PARALLEL_MIN_PAGES = 64 # Below this, process start-up costs more than it saves
+PAGE_BATCH_SIZE = 16 # Pages audited per worker task (one merged result per batch)
+EXTERNAL_CHECK_WORKERS = 64 # Max hosts checked at once (each host is checked serially)
+HOST_REQUEST_DELAY = 0.1 # Pause between two requests to the same host
 
 class Config:
     BASE_URL = ""
     ROOT_DIR = os.getcwd()
     KEYWORDS = []
+    ALL_FILES = frozenset() # Every file under ROOT_DIR (relative, '/'-separated)
 
 # --- Helper Functions ---
 
-def is_ignored_path(path):
-    parts = path.split(os.sep)
-    return any(p in IGNORE_PATHS for p in parts)
+def iter_site_files(root, rel_dir=''):
+    """
+    Yields (abs_path, rel_path) for every file under root, skipping IGNORE_PATHS.
+    Same order as os.walk (a directory's files before its subdirectories), but the
+    relative path is built along the way instead of via os.path.relpath.
+    """
+    subdirs = []
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_dir():
+                # Like os.walk, don't descend into symlinked directories
+                if entry.name not in IGNORE_PATHS and not entry.is_symlink():
+                    subdirs.append(entry)
+            else:
+                yield entry.path, os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+    
+    for entry in subdirs:
+        yield from iter_site_files(entry.path, os.path.join(rel_dir, entry.name) if rel_dir else entry.name)
 
 def is_ignored_file(filename):
     return any(ignored in filename for ignored in IGNORE_FILES) or not filename.endswith('.html')
 
+def page_urls_for(rel_path):
+    """
+    Returns (clean_url, file_url) for an HTML file path relative to root.
+    e.g., blog/post.html -> ("/blog/post", "/blog/post.html")
+    e.g., blog/index.html -> ("/blog", "/blog/index.html")
+    """
+    if rel_path.endswith('index.html'):
+        url_path = '/' + os.path.dirname(rel_path)
+        if url_path == '/.': url_path = '/' # Handle root index
+    else:
+        url_path = '/' + rel_path[:-5] # remove .html
+    
+    return normalize_url_key(url_path), '/' + rel_path.replace('\\', '/')
+
 def is_external(url):
-    return bool(urlparse(url).netloc)
+    # Kept for callers outside the link loop; check_links matches EXTERNAL_URL_RE inline
+    return EXTERNAL_URL_RE.match(url) is not None
+
+@functools.lru_cache(maxsize=None)
+def canonicalize_external(url):
+    """
+    Normalizes an external URL so trivially different spellings are checked once.
+    Example: "HTTPS://Example.com:443/docs/?b=2&a=1#top" -> "https://example.com/docs?a=1&b=2"
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    
+    # Drop default ports
+    host, _, port = netloc.rpartition(':')
+    if (scheme, port) in (('http', '80'), ('https', '443')):
+        netloc = host
+    
+    path = parts.path or '/'
+    if path != '/' and path.endswith('/'):
+        path = path[:-1]
+    
+    query = '&'.join(sorted(parts.query.split('&'))) if parts.query else ''
+    return urlunsplit((scheme, netloc, path, query, ''))
+
+_PATH_INTERN = {}
+
+def intern_path(path):
+    """Returns one shared string object per URL path (nav/footer paths repeat on every page)"""
+    if len(_PATH_INTERN) >= PATH_INTERN_MAX:
+        _PATH_INTERN.clear()
+    return _PATH_INTERN.setdefault(path, path)
 
+@functools.lru_cache(maxsize=65536)
+def normalize_url_key(path):
+    """
+    The one place URL paths are cleaned for lookups and inbound link counting:
+    drops fragment and query string, turns '\\' into '/', removes the trailing
+    slash (except for root) and maps '' to '/'.
+    Example: "/blog/?page=2#top" -> "/blog"
+    """
+    path = path.split('#', 1)[0].split('?', 1)[0].replace('\\', '/')
+    if path != '/' and path.endswith('/'):
+        path = path[:-1]
+    return intern_path(path or '/')
+
+# Config.ROOT_DIR is fixed for the whole run, so link resolution can be memoized
+@functools.lru_cache(maxsize=16384)
 def normalize_local_url(url, current_file_path):
     """
     Resolves relative URLs to absolute path from root.
@@ -56,6 +153,7 @@ def normalize_local_url(url, current_file_path):
     joined = urljoin(dummy_base, url)
     return urlparse(joined).path
 
+@functools.lru_cache(maxsize=None)
 def check_local_file_exists(url_path):
     """
     Checks if a local file exists for the given URL path.
@@ -63,36 +161,52 @@ def check_local_file_exists(url_path):
     /blog/post -> root/blog/post.html OR root/blog/post/index.html
     / -> root/index.html
     """
-    # Remove query string and fragment
-    url_path = url_path.split('#')[0].split('?')[0]
-    
-    if url_path.endswith('/'):
-        url_path = url_path[:-1] # Remove trailing slash for path construction
+    url_path = normalize_url_key(url_path)
     
     # Case 0: Root
-    if not url_path:
-        return os.path.exists(os.path.join(Config.ROOT_DIR, 'index.html'))
-
-    # Case 1: Direct file mapping (e.g., /about -> about.html)
-    path1 = os.path.join(Config.ROOT_DIR, url_path.lstrip('/') + '.html')
-    if os.path.exists(path1):
-        return True
-        
-    # Case 2: Directory index mapping (e.g., /blog -> blog/index.html)
-    path2 = os.path.join(Config.ROOT_DIR, url_path.lstrip('/'), 'index.html')
-    if os.path.exists(path2):
-        return True
-        
-    # Case 3: Exact file match (rare if Clean URLs are used, but for resources)
-    # e.g., /images/logo.png
-    path3 = os.path.join(Config.ROOT_DIR, url_path.lstrip('/'))
-    if os.path.exists(path3) and os.path.isfile(path3):
-        return True
-        
-    return False
+    if url_path == '/':
+        return 'index.html' in Config.ALL_FILES
+
+    rel = url_path.lstrip('/')
+    candidates = (
+        rel + '.html',       # Case 1: Direct file mapping (e.g., /about -> about.html)
+        rel + '/index.html', # Case 2: Directory index mapping (e.g., /blog -> blog/index.html)
+        rel,                 # Case 3: Exact file match (e.g., /images/logo.png)
+    )
+    # Existence is checked against the snapshot taken in main(), no stat calls here
+    return any(posixpath.normpath(c) in Config.ALL_FILES for c in candidates)
 
 # --- Core Modules ---
 
+class AuditStrainer(SoupStrainer):
+    """
+    Only builds the tags PageAuditor looks at: <h1>, <a>, <script> and
+    breadcrumb candidates (aria-label / class containing "breadcrumb").
+    Everything inside a kept tag is kept as well.
+    """
+    def __init__(self):
+        # bs4 < 4.13 calls a name function with (name, attrs)
+        super().__init__(name=self.wanted)
+
+    @staticmethod
+    def wanted(name, attrs=None):
+        if name in ('h1', 'a', 'script'):
+            return True
+        if not attrs:
+            return False
+        if 'aria-label' in attrs:
+            return True
+        css_class = attrs.get('class')
+        if isinstance(css_class, (list, tuple)):
+            css_class = ' '.join(css_class)
+        return bool(css_class) and BREADCRUMB_RE.search(css_class) is not None
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        # bs4 >= 4.13 asks the strainer directly, with the raw attributes
+        return self.wanted(name, attrs)
+
+AUDIT_STRAINER = AuditStrainer()
+
 class AutoConfig:
     @staticmethod
     def load():
@@ -103,7 +217,8 @@ class AutoConfig:
             
         try:
             with open(index_path, 'r', encoding='utf-8', errors='ignore') as f:
-                soup = BeautifulSoup(f, 'html.parser')
+                # Only <link>/<meta> are needed for auto-config
+                soup = BeautifulSoup(f, HTML_PARSER, parse_only=SoupStrainer(['link', 'meta']))
                 
                 # Extract Base URL
                 canonical = soup.find('link', rel='canonical')
@@ -133,36 +248,66 @@ class AuditResult:
         self.score = 100
         self.errors = []
         self.warnings = []
+        self.error_count = 0
+        self.warning_count = 0
+        self.issue_kinds = set() # e.g. 'dead_internal', 'orphan'; drives the advice section
         self.infos = []
-        self.inbound_links = defaultdict(int) # url_path -> count
+        self.inbound_links = Counter() # url_path -> count
         self.external_links = set()
         self.pages_scanned = 0
-
-    def add_error(self, msg, penalty=0):
-        self.errors.append(msg)
+        self.penalty = 0 # Unclamped total, so per-page results can be merged
+
+    def add_error(self, msg, penalty=0, kind=None):
+        self.error_count += 1
+        if kind:
+            self.issue_kinds.add(kind)
+        if len(self.errors) < MAX_STORED_ISSUES:
+            self.errors.append(msg)
+        self.penalty += penalty
         self.score = max(0, self.score - penalty)
 
-    def add_warning(self, msg, penalty=0):
-        self.warnings.append(msg)
+    def add_warning(self, msg, penalty=0, kind=None):
+        self.warning_count += 1
+        if kind:
+            self.issue_kinds.add(kind)
+        if len(self.warnings) < MAX_STORED_ISSUES:
+            self.warnings.append(msg)
+        self.penalty += penalty
         self.score = max(0, self.score - penalty)
 
     def add_info(self, msg):
         self.infos.append(msg)
 
+    def merge(self, other):
+        """Folds the findings of another (per-page) result into this one"""
+        self.errors.extend(other.errors[:MAX_STORED_ISSUES - len(self.errors)])
+        self.warnings.extend(other.warnings[:MAX_STORED_ISSUES - len(self.warnings)])
+        self.error_count += other.error_count
+        self.warning_count += other.warning_count
+        self.issue_kinds |= other.issue_kinds
+        self.infos.extend(other.infos)
+        self.inbound_links.update(other.inbound_links)
+        self.external_links |= other.external_links
+        self.pages_scanned += other.pages_scanned
+        self.penalty += other.penalty
+        self.score = max(0, self.score - other.penalty)
+
 class PageAuditor:
-    def __init__(self, file_path, result_obj):
+    def __init__(self, file_path, result_obj, rel_path=None):
         self.file_path = file_path
-        self.rel_path = os.path.relpath(file_path, Config.ROOT_DIR)
+        self.rel_path = rel_path or os.path.relpath(file_path, Config.ROOT_DIR)
         self.result = result_obj
         self.soup = None
-        self.content = ""
+        self.content = b""
         
     def run(self):
         try:
-            with open(self.file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            # Raw bytes go straight to the parser, which decodes them in C
+            with open(self.file_path, 'rb') as f:
                 self.content = f.read()
-                self.soup = BeautifulSoup(self.content, 'html.parser')
-                
+            self.soup = BeautifulSoup(self.content, HTML_PARSER, parse_only=AUDIT_STRAINER, from_encoding='utf-8')
+            
+            self.scan()
             self.check_h1()
             self.check_schema()
             self.check_breadcrumb()
@@ -173,16 +318,40 @@ class PageAuditor:
         except Exception as e:
             self.result.add_error(f"Failed to process {self.rel_path}: {e}")
 
+    def scan(self):
+        """Walks the (strained) tree once and collects what the checks need"""
+        self.h1_count = 0
+        self.has_schema = False
+        self.has_breadcrumb = False
+        self.links = []
+        
+        for tag in self.soup.find_all(True):
+            name = tag.name
+            if name == 'a':
+                if tag.get('href') is not None:
+                    self.links.append(tag)
+            elif name == 'h1':
+                self.h1_count += 1
+            elif name == 'script':
+                if tag.get('type') == 'application/ld+json':
+                    self.has_schema = True
+            
+            if not self.has_breadcrumb:
+                css_class = tag.get('class')
+                if isinstance(css_class, list):
+                    css_class = ' '.join(css_class)
+                if tag.get('aria-label') in ('Breadcrumb', 'breadcrumb') or \
+                   (css_class and BREADCRUMB_RE.search(css_class)):
+                    self.has_breadcrumb = True
+
     def check_h1(self):
-        h1s = self.soup.find_all('h1')
-        if len(h1s) == 0:
-            self.result.add_error(f"Missing H1 tag in {self.rel_path}", penalty=5)
-        elif len(h1s) > 1:
-            self.result.add_warning(f"Multiple H1 tags ({len(h1s)}) in {self.rel_path}", penalty=0) # Google doesn't strictly penalize multiple H1s anymore, but it's bad practice
+        if self.h1_count == 0:
+            self.result.add_error(f"Missing H1 tag in {self.rel_path}", penalty=5, kind='missing_h1')
+        elif self.h1_count > 1:
+            self.result.add_warning(f"Multiple H1 tags ({self.h1_count}) in {self.rel_path}", penalty=0) # Google doesn't strictly penalize multiple H1s anymore, but it's bad practice
 
     def check_schema(self):
-        schemas = self.soup.find_all('script', type='application/ld+json')
-        if not schemas:
+        if not self.has_schema:
             self.result.add_warning(f"No Schema (JSON-LD) found in {self.rel_path}", penalty=2)
 
     def check_breadcrumb(self):
@@ -190,19 +359,13 @@ class PageAuditor:
         if self.rel_path == 'index.html':
             return
             
-        has_breadcrumb = False
-        if self.soup.find(attrs={"aria-label": "Breadcrumb"}) or \
-           self.soup.find(attrs={"aria-label": "breadcrumb"}) or \
-           self.soup.find(class_=re.compile("breadcrumb", re.I)):
-            has_breadcrumb = True
-            
-        if not has_breadcrumb:
+        if not self.has_breadcrumb:
             # Check if it's a deep page
             if '/' in self.rel_path.replace('\\', '/'):
                  self.result.add_warning(f"No Breadcrumb found in deep page {self.rel_path}", penalty=0)
 
     def check_links(self):
-        for a in self.soup.find_all('a', href=True):
+        for a in self.links:
             raw_href = a['href']
             
             # Skip ignored links
@@ -210,7 +373,7 @@ class PageAuditor:
                 continue
                 
             # 1. External Links
-            if is_external(raw_href):
+            if EXTERNAL_URL_RE.match(raw_href):
                 # Check for absolute path with own domain (e.g., https://mydomain.com/blog)
                 if Config.BASE_URL and raw_href.startswith(Config.BASE_URL):
                     self.result.add_warning(f"Internal link using full URL in {self.rel_path}: {raw_href} -> Should be relative/absolute path", penalty=2)
@@ -218,7 +381,10 @@ class PageAuditor:
                     if not path: path = "/"
                     self.process_internal_link(path)
                 else:
-                    self.result.external_links.add(raw_href)
+                    url = canonicalize_external(raw_href)
+                    # Only http(s) links can be HEAD-checked
+                    if url.startswith(('http://', 'https://')):
+                        self.result.external_links.add(url)
                     # Check rel attributes for external links
                     rel = a.get('rel', [])
                     if 'noopener' not in rel and 'noreferrer' not in rel:
@@ -232,7 +398,7 @@ class PageAuditor:
     def process_internal_link(self, raw_href):
         # Clean URL check
         if raw_href.endswith('.html') and not raw_href.split('/')[-1] == 'index.html': # Allowing index.html if explicitly linked, though usually / is preferred
-             self.result.add_warning(f"Link with .html extension in {self.rel_path}: {raw_href} -> Should be Clean URL", penalty=2)
+             self.result.add_warning(f"Link with .html extension in {self.rel_path}: {raw_href} -> Should be Clean URL", penalty=2, kind='html_ext')
         
         # Relative path check (Warning)
         if not raw_href.startswith('/'):
@@ -243,48 +409,105 @@ class PageAuditor:
         
         # Dead Link Check
         if not check_local_file_exists(abs_path):
-            self.result.add_error(f"Dead Internal Link in {self.rel_path}: {raw_href} (Resolves to {abs_path})", penalty=10)
+            self.result.add_error(f"Dead Internal Link in {self.rel_path}: {raw_href} (Resolves to {abs_path})", penalty=10, kind='dead_internal')
         else:
-            # Track inbound links
-            # Normalize for counting (remove trailing slash unless root)
-            clean_path = abs_path.split('#')[0].split('?')[0]
-            if clean_path != '/' and clean_path.endswith('/'):
-                clean_path = clean_path[:-1]
-            if clean_path == '': clean_path = '/'
-            
-            self.result.inbound_links[clean_path] += 1
+            # Track inbound links (same normalized key as the orphan check)
+            self.result.inbound_links[normalize_url_key(abs_path)] += 1
 
 class ExternalLinkChecker:
+    _session = None # Shared keep-alive session, created on first check_all()
+
+    @classmethod
+    def get_session(cls):
+        if cls._session is None:
+            session = requests.Session()
+            session.headers['User-Agent'] = 'Mozilla/5.0 (compatible; SEOAuditBot/1.0)'
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=100, max_retries=0)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            cls._session = session
+        return cls._session
+
     @staticmethod
     def check_all(links):
         print(f"\n{Fore.CYAN}[INFO] Checking {len(links)} unique external links asynchronously...")
         dead_links = []
+        if not links:
+            return dead_links
+        ExternalLinkChecker.get_session()
+        
+        # One queue per host: hosts are checked in parallel, a single host never
+        # sees more than one request at a time (and reuses its keep-alive connection)
+        by_host = defaultdict(list)
+        for url in links:
+            by_host[urlparse(url).netloc.lower()].append(url)
         
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_url = {executor.submit(ExternalLinkChecker.check_one, url): url for url in links}
-            for future in concurrent.futures.as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    status, msg = future.result()
-                    if status >= 400:
-                        dead_links.append((url, status))
-                except Exception as exc:
-                    dead_links.append((url, str(exc)))
+        max_workers = min(EXTERNAL_CHECK_WORKERS, len(by_host))
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(ExternalLinkChecker.check_host, urls) for urls in by_host.values()]
+            for future in concurrent.futures.as_completed(futures):
+                dead_links.extend(future.result())
                     
         return dead_links
 
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def resolves(hostname):
+        """DNS lookup, once per host"""
+        try:
+            socket.getaddrinfo(hostname, None)
+            return True
+        except (socket.gaierror, UnicodeError):
+            return False
+
+    @staticmethod
+    def check_host(urls):
+        """Checks one host's URLs one after another, returns the dead ones"""
+        hostname = urlparse(urls[0]).hostname
+        if not hostname or not ExternalLinkChecker.resolves(hostname):
+            # Host doesn't resolve: every URL on it is dead, no need to wait for timeouts
+            return [(url, "DNS lookup failed") for url in urls]
+        
+        dead_links = []
+        for i, url in enumerate(urls):
+            if i:
+                time.sleep(HOST_REQUEST_DELAY)
+            try:
+                status, msg = ExternalLinkChecker.check_one(url)
+                if status >= 400:
+                    dead_links.append((url, status))
+            except Exception as exc:
+                dead_links.append((url, str(exc)))
+        return dead_links
+
     @staticmethod
     def check_one(url):
-        headers = {'User-Agent': 'Mozilla/5.0 (compatible; SEOAuditBot/1.0)'}
+        session = ExternalLinkChecker.get_session()
         try:
-            r = requests.head(url, headers=headers, timeout=5, allow_redirects=True)
+            r = session.head(url, timeout=5, allow_redirects=True)
             # If 405 Method Not Allowed, try GET
             if r.status_code == 405:
-                r = requests.get(url, headers=headers, timeout=5, stream=True)
+                r.close()
+                r = session.get(url, timeout=5, stream=True)
+            # Only the status is needed; hand the connection back to the pool now
+            r.close()
             return r.status_code, "OK"
         except requests.exceptions.RequestException as e:
             return 999, str(e)
 
+def init_worker(base_url, keywords, all_files):
+    """Copies the auto-detected Config into a worker process"""
+    Config.BASE_URL = base_url
+    Config.KEYWORDS = keywords
+    Config.ALL_FILES = all_files
+
+def audit_files(pages):
+    """Audits a batch of (abs_path, rel_path) pages into one AuditResult (runs in a worker process)"""
+    batch_result = AuditResult()
+    for file_path, rel_path in pages:
+        PageAuditor(file_path, batch_result, rel_path).run()
+    return batch_result
+
 # --- Main Execution ---
 
 def main():
@@ -296,64 +519,42 @@ def main():
     audit_result = AuditResult()
     
     # 2. Walk Directory
-    html_files = []
-    for root, dirs, files in os.walk(Config.ROOT_DIR):
-        # Modify dirs in-place to skip ignored directories
-        dirs[:] = [d for d in dirs if not is_ignored_path(os.path.join(root, d))]
-        
-        for file in files:
-            if file.endswith('.html') and not is_ignored_file(file):
-                html_files.append(os.path.join(root, file))
+    html_files = [] # (abs_path, rel_path)
+    page_urls = [] # (clean_url, file_url, rel_path) for the orphan check, index.html excluded
+    all_files = set()
+    for file_path, rel_path in iter_site_files(Config.ROOT_DIR):
+        all_files.add(rel_path.replace(os.sep, '/'))
+        if not is_ignored_file(os.path.basename(rel_path)):
+            html_files.append((file_path, rel_path))
+            if rel_path != 'index.html':
+                page_urls.append((*page_urls_for(rel_path), rel_path))
+    
+    # Snapshot of the tree, used for dead-link checks instead of per-link stat calls
+    Config.ALL_FILES = frozenset(all_files)
                 
     print(f"{Fore.BLUE}[INFO] Found {len(html_files)} HTML files to scan.")
     
     # 3. Audit Pages
-    for file_path in html_files:
-        auditor = PageAuditor(file_path, audit_result)
-        auditor.run()
+    # Pages are independent, so large sites are parsed across processes.
+    # Each worker task audits a batch into one result, so the parent merges
+    # one result per batch; map() keeps file order, matching a serial run.
+    if len(html_files) < PARALLEL_MIN_PAGES:
+        audit_result.merge(audit_files(html_files))
+    else:
+        batches = [html_files[i:i + PAGE_BATCH_SIZE] for i in range(0, len(html_files), PAGE_BATCH_SIZE)]
+        with concurrent.futures.ProcessPoolExecutor(
+            initializer=init_worker,
+            initargs=(Config.BASE_URL, Config.KEYWORDS, Config.ALL_FILES),
+        ) as executor:
+            for batch_result in executor.map(audit_files, batches):
+                audit_result.merge(batch_result)
         
     # 4. Orphan Page Check
-    # Convert file paths to expected URL paths for comparison
-    for file_path in html_files:
-        rel_path = os.path.relpath(file_path, Config.ROOT_DIR)
-        
-        # Skip index.html from orphan check
-        if rel_path == 'index.html':
-            continue
-            
-        # Determine likely URL path(s) for this file
-        # e.g., blog/post.html -> /blog/post
-        # e.g., blog/index.html -> /blog
-        url_paths = []
-        
-        if rel_path.endswith('index.html'):
-            url_paths.append('/' + os.path.dirname(rel_path))
-            if url_paths[0] == '/.': url_paths[0] = '/' # Handle root index
-        else:
-            url_paths.append('/' + rel_path[:-5]) # remove .html
-            
-        # Normalize paths (ensure leading slash, no trailing slash unless root)
-        normalized_paths = []
-        for p in url_paths:
-            p = p.replace('\\', '/')
-            if p != '/' and p.endswith('/'): p = p[:-1]
-            normalized_paths.append(p)
-            
-        # Check if any of these possible URLs have inbound links
-        is_orphan = True
-        for p in normalized_paths:
-            if audit_result.inbound_links.get(p, 0) > 0:
-                is_orphan = False
-                break
-                
-        # Also check exact file match in inbound links (in case of .html links)
-        # e.g. /about.html
-        raw_file_url = '/' + rel_path.replace('\\', '/')
-        if audit_result.inbound_links.get(raw_file_url, 0) > 0:
-            is_orphan = False
-            
-        if is_orphan:
-            audit_result.add_warning(f"Orphan Page (No inbound links): {rel_path}", penalty=5)
+    # Page URLs were worked out during the walk; a page is an orphan if neither
+    # its clean URL nor its raw .html URL received any inbound links.
+    for url_path, file_url, rel_path in page_urls:
+        if not audit_result.inbound_links.get(url_path) and not audit_result.inbound_links.get(file_url):
+            audit_result.add_warning(f"Orphan Page (No inbound links): {rel_path}", penalty=5, kind='orphan')
 
     # 5. External Link Check
     if audit_result.external_links:
@@ -372,15 +573,17 @@ def main():
         
     # Issues
     if audit_result.errors:
-        print(f"\n{Fore.RED}Errors ({len(audit_result.errors)}):{Style.RESET_ALL}")
+        print(f"\n{Fore.RED}Errors ({audit_result.error_count}):{Style.RESET_ALL}")
+        if audit_result.error_count > len(audit_result.errors):
+            print(f"  (Showing first {len(audit_result.errors)} of {audit_result.error_count})")
         for err in audit_result.errors:
             print(f"  - {err}")
             
     if audit_result.warnings:
-        print(f"\n{Fore.YELLOW}Warnings ({len(audit_result.warnings)}):{Style.RESET_ALL}")
+        print(f"\n{Fore.YELLOW}Warnings ({audit_result.warning_count}):{Style.RESET_ALL}")
         # Limit warnings output if too many
-        if len(audit_result.warnings) > 20:
-             print(f"  (Showing first 20 of {len(audit_result.warnings)})")
+        if audit_result.warning_count > 20:
+             print(f"  (Showing first 20 of {audit_result.warning_count})")
              for warn in audit_result.warnings[:20]:
                 print(f"  - {warn}")
         else:
@@ -396,13 +599,13 @@ def main():
     
     if audit_result.score < 100:
         print(f"\n{Fore.BLUE}Actionable Advice:{Style.RESET_ALL}")
-        if any("Dead Internal Link" in e for e in audit_result.errors):
+        if 'dead_internal' in audit_result.issue_kinds:
             print("- Fix broken internal links immediately. They are bad for SEO and UX.")
-        if any("Missing H1" in e for e in audit_result.errors):
+        if 'missing_h1' in audit_result.issue_kinds:
             print("- Ensure every page has exactly one H1 tag describing the content.")
-        if any("Orphan Page" in w for w in audit_result.warnings):
+        if 'orphan' in audit_result.issue_kinds:
             print("- Link to orphan pages from other parts of your site (e.g., Blog Index, Sitemap).")
-        if any("Link with .html extension" in w for w in audit_result.warnings):
+        if 'html_ext' in audit_result.issue_kinds:
             print("- Update internal links to use Clean URLs (remove .html suffix) to match server routing.")
 
 if __name__ == "__main__":
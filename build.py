@@ -1,23 +1,81 @@
 import os
 import re
 import json
+import html
 import copy
-import xml.etree.ElementTree as ET
+import hashlib
+import mmap
+import functools
+from xml.sax.saxutils import escape as xml_escape
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from bs4 import BeautifulSoup, Tag
 
+# Prefer the lxml C parser (HTML and sitemap XML); fall back to the built-in ones if it isn't installed
+try:
+    from lxml import etree as ET
+    HTML_PARSER = 'lxml'
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HTML_PARSER = 'html.parser'
+
 # Configuration
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 INDEX_PATH = os.path.join(BASE_DIR, 'index.html')
 BLOG_DIR = os.path.join(BASE_DIR, 'blog')
 DOMAIN = "https://ins-mai.top"
+REC_SECTION_CLASS = 'mt-12 pt-12 border-t border-white/10'
+REC_LIMIT = 4 # Cards in each article's Recommended Reading grid
+PARALLEL_MIN_POSTS = 16 # Below this, process start-up costs more than it saves
+WRITE_WORKERS = 8 # Threads for the Phase 4 page writes
+SITEMAP_NS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+SITEMAP_URL_TAG = f'{{{SITEMAP_NS}}}url'
+SITEMAP_LOC_TAG = f'{{{SITEMAP_NS}}}loc'
+SITEMAP_LASTMOD_TAG = f'{{{SITEMAP_NS}}}lastmod'
+ATTR_ENTITIES = {'"': '&quot;'} # Extra escapes for double-quoted XML attribute values
+# First crumb of every generated BreadcrumbList
+ROOT_CRUMB = {"@type": "ListItem", "position": 1, "name": "首页", "item": f"{DOMAIN}/"}
+# Post metadata and output stats from the last build, for incremental rebuilds
+BUILD_CACHE_PATH = os.path.join(BASE_DIR, '.build-cache.json')
+
+# rel tokens treated as favicons (copied from index.html into every post's head)
+ICON_RELS = frozenset({'icon', 'apple-touch-icon', 'apple-touch-icon-precomposed', 'mask-icon'})
+
+# Blog scan: metadata is read from the raw bytes with these instead of a full parse
+TITLE_RE = re.compile(rb'<title[^>]*>(.*?)</title>', re.S | re.I)
+DESC_META_RE = re.compile(rb'<meta\s[^>]*?(?<![\w-])name=["\']description["\'][^>]*>', re.I)
+META_CONTENT_RE = re.compile(rb'(?<![\w-])content=(["\'])(.*?)\1', re.S | re.I)
+JSON_LD_RE = re.compile(rb'<script[^>]*?type=["\']application/ld\+json["\'][^>]*>(.*?)</script>', re.S | re.I)
+# clean_title patterns
+TITLE_SUFFIX_RE = re.compile(r'\s*\|\s*Ins-mai\.top', re.IGNORECASE)
+# We don't use \b because in Chinese text, years might be adjacent to characters (e.g. 2026最新)
+YEAR_RE = re.compile(r'20[2-3][0-9]')
+LEADING_NUMBER_RE = re.compile(r'^\d+\.\s*')
+# Only datePublished is read from a post's JSON-LD; grab it without building the dict
+DATE_RE = re.compile(r'"datePublished"\s*:\s*"([^"]+)"')
 
 def read_file(path):
-    with open(path, 'r', encoding='utf-8') as f:
+    # Raw bytes: the parser decodes them itself (see parse_html)
+    with open(path, 'rb') as f:
         return f.read()
 
-def write_file(path, content):
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write(content)
+def parse_html(data):
+    # Files are always UTF-8, so tell the parser instead of letting it guess
+    return BeautifulSoup(data, HTML_PARSER, from_encoding='utf-8')
+
+def write_file(path, *chunks):
+    # Takes the bytes from soup.encode(), skipping the intermediate str.
+    # Written to a temp file and swapped in, so an interrupted build never leaves a truncated page
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.writelines(chunks)
+    os.replace(tmp_path, path)
+
+def encode_page(soup):
+    # Returned as chunks so the doctype is written ahead of the page instead of copied onto it
+    data = soup.encode('utf-8')
+    if data.startswith(b'<!DOCTYPE html>'):
+        return (data,)
+    return (b'<!DOCTYPE html>\n', data)
 
 def clean_url(url):
     if not url:
@@ -33,11 +91,16 @@ def clean_url(url):
     return url
 
 def clean_nav_footer_links(tag):
-    for a in tag.find_all('a'):
-        if a.has_attr('href'):
-            a['href'] = clean_url(a['href'])
+    # href=True filters inside the tree search, so only real links come back
+    for a in tag.find_all('a', href=True):
+        a['href'] = clean_url(a['href'])
     return tag
 
+def rel_tokens(tag):
+    # rel is multi-valued: bs4 gives a list, but a plain string is possible too
+    rel = tag.get('rel', [])
+    return set(rel) if isinstance(rel, list) else set(rel.split())
+
 def clean_title(title):
     """
     Clean title for Evergreen SEO:
@@ -49,14 +112,13 @@ def clean_title(title):
         return ""
     
     # Remove suffix | Ins-mai.top (case insensitive)
-    title = re.sub(r'\s*\|\s*Ins-mai\.top', '', title, flags=re.IGNORECASE)
+    title = TITLE_SUFFIX_RE.sub('', title)
     
     # Remove years (2020-2035) to ensure evergreen
-    # We don't use \b because in Chinese text, years might be adjacent to characters (e.g. 2026最新)
-    title = re.sub(r'20[2-3][0-9]', '', title)
+    title = YEAR_RE.sub('', title)
     
     # Remove leading numbering (e.g. "1. ", "01. ")
-    title = re.sub(r'^\d+\.\s*', '', title)
+    title = LEADING_NUMBER_RE.sub('', title)
     
     return title.strip()
 
@@ -75,6 +137,72 @@ def indent(elem, level=0):
         if level and (not elem.tail or not elem.tail.strip()):
             elem.tail = i
 
+def qualify(name, prefixes):
+    # '{uri}local' -> 'prefix:local' using the sitemap's own namespace prefixes
+    if not name.startswith('{'):
+        return name
+    uri, local = name[1:].split('}', 1)
+    prefix = prefixes.get(uri)
+    return f"{prefix}:{local}" if prefix else local
+
+def sitemap_entries(root, events, pending, stats):
+    """Yield every <url> of the sitemap with its lastmod synced to the posts, then the new URLs.
+    Entries are the parsed elements themselves, so extension children, attributes and comments survive."""
+    for event, elem in events:
+        if event != 'end' or elem.tag != SITEMAP_URL_TAG:
+            continue
+        loc = elem.findtext(SITEMAP_LOC_TAG)
+        date_str = pending.pop(loc.strip(), None) if loc else None
+        if date_str is not None:
+            lastmod = elem.find(SITEMAP_LASTMOD_TAG)
+            if lastmod is None:
+                lastmod = ET.SubElement(elem, SITEMAP_LASTMOD_TAG)
+            if lastmod.text != date_str:
+                lastmod.text = date_str
+                stats['updated'] += 1
+        indent(elem, 1)
+        yield elem
+        # Drop processed entries once they're written (root.clear() would also drop lxml's namespace map)
+        root.remove(elem)
+        
+    # Add new URLs
+    for full_url, date_str in pending.items():
+        # Created under root so lxml reuses the sitemap's own (default) namespace prefix
+        new_url = ET.SubElement(root, SITEMAP_URL_TAG)
+        for tag, text in ((SITEMAP_LOC_TAG, full_url), (SITEMAP_LASTMOD_TAG, date_str),
+                          (f'{{{SITEMAP_NS}}}changefreq', 'weekly'), (f'{{{SITEMAP_NS}}}priority', '0.8')):
+            ET.SubElement(new_url, tag).text = text
+        stats['updated'] += 1
+        indent(new_url, 1)
+        yield new_url
+        root.remove(new_url)
+
+def write_sitemap(path, root, namespaces, entries):
+    # Root tag keeps the source's namespace declarations and attributes (e.g. xsi:schemaLocation)
+    prefixes = {}
+    for prefix, uri in namespaces:
+        # lxml serializes with the parsed prefixes; ElementTree needs them registered
+        if HTML_PARSER != 'lxml':
+            ET.register_namespace(prefix, uri)
+        prefixes[uri] = prefix
+    decls = [f' xmlns:{prefix}="{xml_escape(uri, ATTR_ENTITIES)}"' if prefix else f' xmlns="{xml_escape(uri, ATTR_ENTITIES)}"'
+             for prefix, uri in namespaces]
+    attrs = ''.join(f' {qualify(k, prefixes)}="{xml_escape(v, ATTR_ENTITIES)}"' for k, v in root.attrib.items())
+    tag = qualify(root.tag, prefixes)
+    with open(path, 'w', encoding='utf-8') as out:
+        out.write("<?xml version='1.0' encoding='UTF-8'?>\n")
+        out.write(f'<{tag}{"".join(decls)}{attrs}>')
+        for elem in entries:
+            elem.tail = None
+            xml = ET.tostring(elem, encoding='unicode')
+            # A detached element re-declares the namespaces it uses; the root already declares them
+            end = xml.index('>')
+            start_tag = xml[:end]
+            for decl in decls:
+                start_tag = start_tag.replace(decl, '', 1)
+            out.write('\n    ' + start_tag + xml[end:])
+        out.write(f'\n</{tag}>\n')
+
 def update_sitemap(posts):
     print("Updating sitemap.xml...")
     sitemap_path = os.path.join(BASE_DIR, 'sitemap.xml')
@@ -82,87 +210,325 @@ def update_sitemap(posts):
         print("Sitemap not found, skipping update.")
         return
 
+    # Posts still to be matched against an existing <url>; leftovers are appended as new URLs
+    pending = {f"{DOMAIN}{post['url']}": post['date'] for post in posts}
+    stats = {'updated': 0}
+    tmp_path = sitemap_path + '.tmp'
     try:
-        # Register namespace to prevent ns0: prefixes
-        ET.register_namespace('', "http://www.sitemaps.org/schemas/sitemap/0.9")
-        tree = ET.parse(sitemap_path)
-        root = tree.getroot()
-        ns = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-
-        updated_count = 0
-        
-        # Map existing URLs to their elements for easy lookup
-        url_map = {}
-        for url_elem in root.findall('ns:url', ns):
-            loc = url_elem.find('ns:loc', ns)
-            if loc is not None and loc.text:
-                url_map[loc.text.strip()] = url_elem
-
-        for post in posts:
-            full_url = f"{DOMAIN}{post['url']}"
-            date_str = post['date']
-            
-            if full_url in url_map:
-                url_elem = url_map[full_url]
-                lastmod = url_elem.find('ns:lastmod', ns)
-                if lastmod is not None:
-                    if lastmod.text != date_str:
-                        lastmod.text = date_str
-                        updated_count += 1
-                else:
-                    lastmod = ET.SubElement(url_elem, 'lastmod')
-                    lastmod.text = date_str
-                    updated_count += 1
-            else:
-                # Add new URL
-                new_url = ET.SubElement(root, 'url')
-                loc = ET.SubElement(new_url, 'loc')
-                loc.text = full_url
-                lastmod = ET.SubElement(new_url, 'lastmod')
-                lastmod.text = date_str
-                changefreq = ET.SubElement(new_url, 'changefreq')
-                changefreq.text = 'weekly'
-                priority = ET.SubElement(new_url, 'priority')
-                priority.text = '0.8'
-                updated_count += 1
-                
-        # Always indent to ensure clean formatting
-        indent(root)
+        # Stream <url> entries through iterparse so the whole tree is never held in memory
+        if HTML_PARSER == 'lxml':
+            options = {} # lxml keeps comments and processing instructions in the tree
+        else:
+            # ElementTree drops them unless its tree builder is told to keep them
+            options = {'parser': ET.XMLParser(target=ET.TreeBuilder(insert_comments=True, insert_pis=True))}
+        events = ET.iterparse(sitemap_path, events=('start-ns', 'start', 'end'), **options)
+        namespaces = []
+        for event, item in events:
+            if event == 'start-ns':
+                prefix, uri = item
+                namespaces.append((prefix or '', uri))
+            elif event == 'start':
+                root = item
+                break
+        write_sitemap(tmp_path, root, namespaces, sitemap_entries(root, events, pending, stats))
         
-        # Always write if we want to fix formatting, even if updated_count is 0
-        # But to be safe, we only write if updated or if we suspect formatting issues
-        # Let's force write this time to fix the previous mess
-        tree.write(sitemap_path, encoding='UTF-8', xml_declaration=True)
-        print(f"Updated sitemap.xml with {updated_count} changes (and fixed formatting).")
+        # Only replace the sitemap once the new one is complete
+        os.replace(tmp_path, sitemap_path)
+        print(f"Updated sitemap.xml with {stats['updated']} changes (and fixed formatting).")
             
     except Exception as e:
         print(f"Error updating sitemap: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def new_element(soup, name, attrs, text=None):
+    tag = soup.new_tag(name, attrs=attrs)
+    if text is not None:
+        tag.string = text
+    return tag
 
-def get_latest_posts_html(posts, limit=3):
-    # Generate HTML for Recommended Reading
-    html = ""
+def get_latest_post_cards(soup, posts, limit=3):
+    # Build Tags for Recommended Reading / article lists directly in the target soup
+    cards = []
     for post in posts[:limit]:
-        html += f'''
-        <a href="{post['url']}" class="group block glass-card rounded-3xl overflow-hidden hover:bg-white/5 transition-all border-t border-white/10">
-            <div class="h-48 bg-gradient-to-br from-gray-800 via-black to-gray-900 flex items-center justify-center relative overflow-hidden">
-                <div class="absolute top-0 right-0 w-32 h-32 bg-insPurple/20 blur-3xl rounded-full"></div>
-                <i data-lucide="file-text" class="w-12 h-12 text-white/20 group-hover:scale-110 transition-transform duration-500"></i>
-            </div>
-            <div class="p-6">
-                <div class="flex items-center gap-3 mb-3">
-                    <span class="px-2 py-1 rounded bg-insPurple/20 text-insPurple text-[10px] font-bold uppercase">Article</span>
-                    <span class="text-gray-500 text-xs">{post['date']}</span>
-                </div>
-                <h3 class="text-lg font-bold text-white mb-2 group-hover:text-insPurple transition-colors line-clamp-2">
-                    {post['title']}
-                </h3>
-                <p class="text-sm text-gray-400 line-clamp-2">
-                    {post['description']}
-                </p>
-            </div>
-        </a>
-        '''
-    return html
+        card = new_element(soup, 'a', {'href': post['url'], 'class': 'group block glass-card rounded-3xl overflow-hidden hover:bg-white/5 transition-all border-t border-white/10'})
+        
+        cover = new_element(soup, 'div', {'class': 'h-48 bg-gradient-to-br from-gray-800 via-black to-gray-900 flex items-center justify-center relative overflow-hidden'})
+        cover.append(new_element(soup, 'div', {'class': 'absolute top-0 right-0 w-32 h-32 bg-insPurple/20 blur-3xl rounded-full'}))
+        cover.append(new_element(soup, 'i', {'data-lucide': 'file-text', 'class': 'w-12 h-12 text-white/20 group-hover:scale-110 transition-transform duration-500'}))
+        card.append(cover)
+        
+        body = new_element(soup, 'div', {'class': 'p-6'})
+        meta = new_element(soup, 'div', {'class': 'flex items-center gap-3 mb-3'})
+        meta.append(new_element(soup, 'span', {'class': 'px-2 py-1 rounded bg-insPurple/20 text-insPurple text-[10px] font-bold uppercase'}, 'Article'))
+        meta.append(new_element(soup, 'span', {'class': 'text-gray-500 text-xs'}, post['date']))
+        body.append(meta)
+        body.append(new_element(soup, 'h3', {'class': 'text-lg font-bold text-white mb-2 group-hover:text-insPurple transition-colors line-clamp-2'}, post['title']))
+        body.append(new_element(soup, 'p', {'class': 'text-sm text-gray-400 line-clamp-2'}, post['description']))
+        card.append(body)
+        
+        cards.append(card)
+    return cards
+
+def load_build_cache():
+    # A missing or unreadable cache just means a full rebuild
+    try:
+        with open(BUILD_CACHE_PATH, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if isinstance(cache, dict) and isinstance(cache.get('posts'), dict):
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {'fingerprint': '', 'posts': {}}
+
+def save_build_cache(fingerprint, posts):
+    # Stats are taken after Phase 3 wrote the posts, so an untouched post matches next time
+    entries = {}
+    for post in posts:
+        st = os.stat(post['path'])
+        entries[post['filename']] = {
+            'stamp': [st.st_mtime_ns, st.st_size],
+            'title': post['title'],
+            'description': post['description'],
+            'date': post['date']
+        }
+    with open(BUILD_CACHE_PATH, 'w', encoding='utf-8') as f:
+        json.dump({'fingerprint': fingerprint, 'posts': entries}, f, ensure_ascii=False, indent=1)
+
+def breadcrumb_list(name, url):
+    # Two-level BreadcrumbList: 首页 > name
+    return {
+        "@type": "BreadcrumbList",
+        "itemListElement": [
+            ROOT_CRUMB,
+            {
+                "@type": "ListItem",
+                "position": 2,
+                "name": name,
+                "item": url
+            }
+        ]
+    }
+
+def dump_json_ld(data):
+    # Compact: crawlers don't need the indentation and pages get noticeably smaller
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+def describes_other_page(json_text, page_url):
+    # JSON-LD whose mainEntityOfPage is a different URL was copied in from another post
+    try:
+        data = json.loads(json_text or '')
+    except ValueError:
+        return False
+    entity = data.get('mainEntityOfPage') if isinstance(data, dict) else None
+    entity_id = entity.get('@id') if isinstance(entity, dict) else entity
+    return bool(entity_id) and entity_id != page_url
+
+def scan_post_metadata(content, filename):
+    # Title, description and date straight from the raw bytes (or an mmap of them)
+    m = TITLE_RE.search(content)
+    raw_title = html.unescape(m.group(1).decode('utf-8')) if m else filename
+    # Clean title immediately
+    title = clean_title(raw_title)
+    
+    desc = ""
+    desc_meta = DESC_META_RE.search(content)
+    if desc_meta:
+        m = META_CONTENT_RE.search(desc_meta.group(0))
+        if m:
+            desc = html.unescape(m.group(2).decode('utf-8'))
+        
+    date_str = "2026-01-01" # Default
+    json_ld = JSON_LD_RE.search(content)
+    if json_ld:
+        json_ld = json_ld.group(1).decode('utf-8')
+        m = DATE_RE.search(json_ld)
+        if m:
+            date_str = m.group(1)
+        else:
+            # Regex missed (unusual formatting): fall back to a real parse
+            try:
+                data = json.loads(json_ld)
+                if 'datePublished' in data:
+                    date_str = data['datePublished']
+            except:
+                pass
+    return title, desc, date_str
+
+def find_article_grid(soup):
+    # The article grid lives in main > .grid; older layouts keep it in a "Latest"/"Articles" section
+    main_tag = soup.find('main')
+    if main_tag:
+        grid = main_tag.find('div', class_='grid')
+        if grid:
+            return grid, " (via main > grid)"
+    for section in soup.find_all('section'):
+        h2 = section.find('h2')
+        if h2 and ('Latest' in h2.get_text() or 'Articles' in h2.get_text()):
+            grid = section.find('div', class_='grid')
+            if grid:
+                return grid, ""
+    return None, ""
+
+def get_recommendation_card(soup, post):
+    # Compact card used in each article's Recommended Reading grid
+    card = new_element(soup, 'a', {'href': post['url'], 'class': 'group block glass-card rounded-2xl overflow-hidden hover:bg-white/5 transition-all border border-white/5'})
+    body = new_element(soup, 'div', {'class': 'p-5'})
+    meta = new_element(soup, 'div', {'class': 'flex items-center gap-2 mb-2'})
+    meta.append(new_element(soup, 'span', {'class': 'text-xs text-insPurple font-bold'}, 'Read'))
+    meta.append(new_element(soup, 'span', {'class': 'text-xs text-gray-500'}, post['date']))
+    body.append(meta)
+    body.append(new_element(soup, 'h4', {'class': 'text-white font-bold mb-2 group-hover:text-insPurple transition-colors line-clamp-1'}, post['title']))
+    card.append(body)
+    return card
+
+@functools.lru_cache(maxsize=1)
+def load_templates(nav_html, footer_html):
+    # Parse the serialized nav/footer once per process
+    nav_template = BeautifulSoup(nav_html, HTML_PARSER).find('nav') if nav_html else None
+    footer_template = BeautifulSoup(footer_html, HTML_PARSER).find('footer') if footer_html else None
+    return nav_template, footer_template
+
+def process_post(post, rec_candidates, rec_cards, templates):
+    """Phase 2 & 3 for a single post: rebuild <head>, sync layout, inject recommendations, save.
+    Only takes picklable arguments so it can run in a worker process."""
+    nav_template, footer_template = load_templates(*templates[:2])
+    favicons_html = templates[2]
+    soup = parse_html(read_file(post['path']))
+    
+    # --- Phase 2: Head Reconstruction ---
+    original_head = soup.head
+    url = html.escape(f"{DOMAIN}{post['url']}")
+    
+    # Groups A-D are plain markup, so build them as one string and parse it once
+    # Group A: Basic Metadata + Title (Use Cleaned Title)
+    parts = [
+        '<head><meta charset="utf-8">',
+        '<meta content="width=device-width, initial-scale=1.0" name="viewport">',
+        f'<title>{html.escape(post["title"], quote=False)}</title>',
+    ]
+    
+    # Group B: SEO Core
+    if post['description']:
+        parts.append(f'<meta content="{html.escape(post["description"])}" name="description">')
+    
+    keywords = ""
+    kw_meta = original_head.find('meta', attrs={'name': 'keywords'})
+    if kw_meta:
+        keywords = kw_meta.get('content', '')
+    if keywords:
+        parts.append(f'<meta content="{html.escape(keywords)}" name="keywords">')
+        
+    parts.append(f'<link rel="canonical" href="{url}">')
+    
+    # Group C: Indexing & Geo
+    parts.append('<meta content="index, follow" name="robots">')
+    parts.append('<meta http-equiv="content-language" content="zh-cn">')
+    
+    # Hreflang
+    for lang in ('zh', 'zh-CN', 'x-default'):
+        parts.append(f'<link rel="alternate" hreflang="{lang}" href="{url}">')
+    
+    # Group D: Branding & Resources
+    parts.append(favicons_html)
+    parts.append('</head>')
+    new_head = BeautifulSoup(''.join(parts), HTML_PARSER).head
+        
+    # This post's own JSON-LD (the first one) is re-added as Group E below
+    json_ld = soup.find('script', type='application/ld+json')
+    seen_json_ld = {json_ld.string} if json_ld else set()
+    page_url = f"{DOMAIN}{post['url']}"
+    
+    # Preserve Scripts/Styles (Tailwind, Fonts, Custom Styles)
+    # Head elements aren't nested, so walking the direct children is enough
+    for tag in original_head.children:
+        if getattr(tag, 'name', None) not in ('script', 'link', 'style'):
+            continue
+        # Earlier builds left repeated copies of JSON-LD (some from other posts) in the head
+        if tag.name == 'script' and tag.get('type') == 'application/ld+json':
+            if tag.string in seen_json_ld:
+                continue
+            seen_json_ld.add(tag.string)
+            if describes_other_page(tag.string, page_url):
+                continue
+        # Skip favicon links as we added them
+        rel = rel_tokens(tag)
+        if not rel.isdisjoint(ICON_RELS):
+            continue
+        if tag.name == 'link' and ('canonical' in rel or 'alternate' in rel):
+            continue
+            
+        new_head.append(copy.copy(tag))
+        
+    # Group E: Structured Data (this post's own JSON-LD)
+    if json_ld:
+        new_head.append(copy.copy(json_ld))
+        
+    # Replace Head
+    if soup.head:
+        soup.head.replace_with(new_head)
+    else:
+        soup.insert(0, new_head)
+        
+    # --- Phase 3: Content Injection ---
+    
+    # 1. Layout Sync (Nav/Footer)
+    if soup.body:
+        # Replace Nav
+        existing_nav = soup.body.find('nav')
+        if existing_nav and nav_template:
+            existing_nav.replace_with(copy.copy(nav_template))
+        elif nav_template:
+            soup.body.insert(0, copy.copy(nav_template))
+            
+        # Replace Footer
+        existing_footer = soup.body.find('footer')
+        
+        # Remove old Recommended Reading: our module is tagged, so an attribute lookup finds it
+        stale = soup.body.find_all(attrs={'data-generated': 'rec'})
+        if stale:
+            for block in stale:
+                block.decompose()
+        else:
+            # Pages built before the marker: match legacy <section> and module by heading
+            for heading in soup.body.find_all(['h2', 'h3']):
+                if heading.decomposed or 'Recommended Reading' not in heading.get_text():
+                    continue
+                if heading.name == 'h2':
+                    block = heading.find_parent('section')
+                elif heading.string == "Recommended Reading":
+                    block = heading.find_parent('div', class_=REC_SECTION_CLASS)
+                else:
+                    block = None
+                if block:
+                    block.decompose()
+        
+        if existing_footer and footer_template:
+            existing_footer.replace_with(copy.copy(footer_template))
+        elif footer_template:
+            soup.body.append(copy.copy(footer_template))
+            
+    # 3. Smart Recommendation
+    article = soup.find('article')
+    if article:
+        # Create Recommendation Module (any previous one was removed during layout sync)
+        rec_section = soup.new_tag('div', attrs={'class': REC_SECTION_CLASS, 'data-generated': 'rec'})
+        rec_title = soup.new_tag('h3', attrs={'class': 'text-2xl font-bold text-white mb-6'})
+        rec_title.string = "Recommended Reading"
+        rec_section.append(rec_title)
+        
+        rec_grid = soup.new_tag('div', attrs={'class': 'grid grid-cols-1 md:grid-cols-2 gap-6'})
+        
+        # Cards for the top 4 other posts; rec_candidates holds one spare for the current post
+        other_posts = [p for p in rec_candidates if p['filename'] != post['filename']]
+        rec_grid.extend(copy.copy(rec_cards[p['filename']]) for p in other_posts[:REC_LIMIT])
+            
+        rec_section.append(rec_grid)
+        article.append(rec_section)
+        
+    # Save
+    write_file(post['path'], *encode_page(soup))
+    return post['filename']
 
 def main():
     print("Starting build process...")
@@ -170,7 +536,7 @@ def main():
     # 1. Parse index.html
     print("Phase 1: Smart Extraction from index.html")
     index_content = read_file(INDEX_PATH)
-    index_soup = BeautifulSoup(index_content, 'html.parser')
+    index_soup = parse_html(index_content)
     
     # Extract Nav and Footer
     nav_template = index_soup.find('nav')
@@ -183,11 +549,8 @@ def main():
         
     # Extract Favicons
     favicons = []
-    for link in index_soup.find_all('link'):
-        rel = link.get('rel', [])
-        if isinstance(rel, list):
-            rel = " ".join(rel)
-        if 'icon' in rel:
+    for link in index_soup.find_all('link', rel=True):
+        if not rel_tokens(link).isdisjoint(ICON_RELS):
             new_link = copy.copy(link)
             href = new_link.get('href', '')
             if href and not href.startswith('/') and not href.startswith('http'):
@@ -197,31 +560,27 @@ def main():
     # 2. Scan Blog Posts
     print("Scanning blog posts...")
     posts = []
+    cache = load_build_cache()
+    unchanged = set() # Posts whose file matches the stats recorded by the last build
     if os.path.exists(BLOG_DIR):
-        blog_files = [f for f in os.listdir(BLOG_DIR) if f.endswith('.html') and f != 'index.html']
+        with os.scandir(BLOG_DIR) as it:
+            blog_entries = [e for e in it if e.name.endswith('.html') and e.name != 'index.html' and e.is_file()]
         
-        for filename in blog_files:
-            path = os.path.join(BLOG_DIR, filename)
-            soup = BeautifulSoup(read_file(path), 'html.parser')
-            
-            raw_title = soup.title.string if soup.title else filename
-            # Clean title immediately
-            title = clean_title(raw_title)
-            
-            desc = ""
-            desc_meta = soup.find('meta', attrs={'name': 'description'})
-            if desc_meta:
-                desc = desc_meta.get('content', '')
-                
-            date_str = "2026-01-01" # Default
-            json_ld = soup.find('script', type='application/ld+json')
-            if json_ld and json_ld.string:
-                try:
-                    data = json.loads(json_ld.string)
-                    if 'datePublished' in data:
-                        date_str = data['datePublished']
-                except:
-                    pass
+        for entry in blog_entries:
+            filename, path = entry.name, entry.path
+            st = entry.stat()
+            cached = cache['posts'].get(filename)
+            if cached and cached.get('stamp') == [st.st_mtime_ns, st.st_size]:
+                title, desc, date_str = cached['title'], cached['description'], cached['date']
+                unchanged.add(filename)
+            else:
+                # Metadata is regex-scanned on a read-only mapping; the tree is only built in Phase 2 & 3
+                with open(path, 'rb') as f:
+                    if st.st_size:
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                            title, desc, date_str = scan_post_metadata(content, filename)
+                    else: # Empty files can't be mapped
+                        title, desc, date_str = scan_post_metadata(b'', filename)
                     
             posts.append({
                 'title': title,
@@ -237,160 +596,44 @@ def main():
     
     # 3. Process Each Blog Post
     print("Phase 2 & 3: Processing blog posts...")
-    for post in posts:
-        print(f"Processing {post['filename']}...")
-        soup = BeautifulSoup(read_file(post['path']), 'html.parser')
-        
-        # --- Phase 2: Head Reconstruction ---
-        original_head = soup.head
-        new_head = soup.new_tag('head')
-        
-        # Group A: Basic Metadata
-        new_head.append(soup.new_tag('meta', charset='utf-8'))
-        new_head.append(soup.new_tag('meta', attrs={'content': 'width=device-width, initial-scale=1.0', 'name': 'viewport'}))
-        
-        # Title (Use Cleaned Title)
-        title_tag = soup.new_tag('title')
-        title_tag.string = post['title']
-        new_head.append(title_tag)
-        
-        # Group B: SEO Core
-        if post['description']:
-            new_head.append(soup.new_tag('meta', attrs={'content': post['description'], 'name': 'description'}))
-        
-        keywords = ""
-        kw_meta = original_head.find('meta', attrs={'name': 'keywords'})
-        if kw_meta:
-            keywords = kw_meta.get('content', '')
-        if keywords:
-            new_head.append(soup.new_tag('meta', attrs={'content': keywords, 'name': 'keywords'}))
-            
-        new_head.append(soup.new_tag('link', rel='canonical', href=f"{DOMAIN}{post['url']}"))
-        
-        # Group C: Indexing & Geo
-        new_head.append(soup.new_tag('meta', attrs={'content': 'index, follow', 'name': 'robots'}))
-        new_head.append(soup.new_tag('meta', attrs={'http-equiv': 'content-language', 'content': 'zh-cn'}))
-        
-        # Hreflang
-        new_head.append(soup.new_tag('link', rel='alternate', hreflang='zh', href=f"{DOMAIN}{post['url']}"))
-        new_head.append(soup.new_tag('link', rel='alternate', hreflang='zh-CN', href=f"{DOMAIN}{post['url']}"))
-        new_head.append(soup.new_tag('link', rel='alternate', hreflang='x-default', href=f"{DOMAIN}{post['url']}"))
-        
-        # Group D: Branding & Resources
-        for icon in favicons:
-            new_head.append(copy.copy(icon))
-            
-        # Preserve Scripts/Styles (Tailwind, Fonts, Custom Styles)
-        for tag in original_head.find_all(['script', 'link', 'style']):
-            # Skip favicon links as we added them
-            rel = tag.get('rel', [])
-            if isinstance(rel, list): rel = " ".join(rel)
-            if 'icon' in rel:
-                continue
-            if tag.name == 'link' and 'canonical' in rel:
-                continue
-            if tag.name == 'link' and 'alternate' in rel:
-                continue
-                
-            new_head.append(copy.copy(tag))
-            
-        # Group E: Structured Data
-        if json_ld:
-            new_head.append(copy.copy(json_ld))
-            
-        # Replace Head
-        if soup.head:
-            soup.head.replace_with(new_head)
-        else:
-            soup.insert(0, new_head)
-            
-        # --- Phase 3: Content Injection ---
-        
-        # 1. Layout Sync (Nav/Footer)
-        if soup.body:
-            # Replace Nav
-            existing_nav = soup.body.find('nav')
-            if existing_nav and nav_template:
-                existing_nav.replace_with(copy.copy(nav_template))
-            elif nav_template:
-                soup.body.insert(0, copy.copy(nav_template))
-                
-            # Replace Footer
-            existing_footer = soup.body.find('footer')
-            
-            # Remove old Recommended Reading
-            for section in soup.find_all('section'):
-                h2 = section.find('h2')
-                if h2 and 'Recommended Reading' in h2.get_text():
-                    section.decompose()
-            
-            if existing_footer and footer_template:
-                existing_footer.replace_with(copy.copy(footer_template))
-            elif footer_template:
-                soup.body.append(copy.copy(footer_template))
-                
-        # 3. Smart Recommendation
-        article = soup.find('article')
-        if article:
-            # Remove existing Recommended Reading to ensure we can update it
-            for div in article.find_all('div', class_='mt-12 pt-12 border-t border-white/10'):
-                h3 = div.find('h3')
-                if h3 and h3.string == "Recommended Reading":
-                    div.decompose()
-            
-            # Create Recommendation Module
-            rec_section = soup.new_tag('div', attrs={'class': 'mt-12 pt-12 border-t border-white/10'})
-            rec_title = soup.new_tag('h3', attrs={'class': 'text-2xl font-bold text-white mb-6'})
-            rec_title.string = "Recommended Reading"
-            rec_section.append(rec_title)
-            
-            rec_grid = soup.new_tag('div', attrs={'class': 'grid grid-cols-1 md:grid-cols-2 gap-6'})
-            
-            # Get other posts
-            other_posts = [p for p in posts if p['filename'] != post['filename']]
-            
-            # Generate HTML for top 4 posts
-            for p in other_posts[:4]: 
-                card_html = f'''
-                <a href="{p['url']}" class="group block glass-card rounded-2xl overflow-hidden hover:bg-white/5 transition-all border border-white/5">
-                    <div class="p-5">
-                        <div class="flex items-center gap-2 mb-2">
-                            <span class="text-xs text-insPurple font-bold">Read</span>
-                            <span class="text-xs text-gray-500">{p['date']}</span>
-                        </div>
-                        <h4 class="text-white font-bold mb-2 group-hover:text-insPurple transition-colors line-clamp-1">
-                            {p['title']}
-                        </h4>
-                    </div>
-                </a>
-                '''
-                card = BeautifulSoup(card_html, 'html.parser')
-                if card.body and card.body.contents:
-                    for child in card.body.contents:
-                        if child.name:
-                            rec_grid.append(child)
-                elif card.contents:
-                     for child in card.contents:
-                        if child.name:
-                            rec_grid.append(child)
-                
-            rec_section.append(rec_grid)
-            article.append(rec_section)
-            
-        # Save
-        output_html = str(soup)
-        if not output_html.startswith('<!DOCTYPE html>'):
-            output_html = '<!DOCTYPE html>\n' + output_html
-            
-        write_file(post['path'], output_html)
+    # Templates travel as strings (cheap to pickle); the recommendation cards only need metadata
+    templates = (
+        str(nav_template) if nav_template else '',
+        str(footer_template) if footer_template else '',
+        ''.join(str(icon) for icon in favicons)
+    )
+    rec_candidates = [{k: p[k] for k in ('title', 'date', 'url', 'filename')} for p in posts[:REC_LIMIT + 1]]
+    # Every post recommends from the same few candidates, so their cards are built once here and copied per post
+    card_soup = BeautifulSoup('', HTML_PARSER)
+    rec_cards = {p['filename']: get_recommendation_card(card_soup, p) for p in rec_candidates}
+    worker = functools.partial(process_post, rec_candidates=rec_candidates, rec_cards=rec_cards, templates=templates)
+    
+    # An untouched post only needs rewriting if its inputs (templates, recommendations, this script) changed
+    hasher = hashlib.sha1(read_file(os.path.abspath(__file__)))
+    hasher.update(json.dumps([templates, rec_candidates], ensure_ascii=False).encode('utf-8'))
+    fingerprint = hasher.hexdigest()
+    if fingerprint == cache.get('fingerprint'):
+        pending = [p for p in posts if p['filename'] not in unchanged]
+        print(f"Skipping {len(posts) - len(pending)} unchanged posts")
+    else:
+        pending = posts
+    
+    # Posts are independent, so large blogs are processed across processes
+    if len(pending) < PARALLEL_MIN_POSTS:
+        for filename in map(worker, pending):
+            print(f"Processed {filename}")
+    else:
+        with ProcessPoolExecutor() as executor:
+            for filename in executor.map(worker, pending):
+                print(f"Processed {filename}")
+    save_build_cache(fingerprint, posts)
         
     # --- Phase 4: Global Update (Sync Homepage & Aggregation) ---
+    # Page writes go to a thread pool so disk I/O overlaps with parsing the next page
+    writer = ThreadPoolExecutor(max_workers=WRITE_WORKERS)
+    pending_writes = []
     print("Phase 4: Global Update...")
     
-    # Generate HTML for latest 3 articles
-    latest_html = get_latest_posts_html(posts, limit=3)
-    latest_soup_fragment = BeautifulSoup(latest_html, 'html.parser')
-    
     # Update index.html
     if index_soup.body:
         # Find the "Latest Articles" section
@@ -400,23 +643,19 @@ def main():
                 grid = section.find('div', class_='grid')
                 if grid:
                     grid.clear()
-                    if latest_soup_fragment.body:
-                         for child in latest_soup_fragment.body.contents:
-                            if child.name: grid.append(copy.copy(child))
-                    else:
-                         for child in latest_soup_fragment.contents:
-                            if child.name: grid.append(copy.copy(child))
+                    # Latest 3 articles
+                    grid.extend(get_latest_post_cards(index_soup, posts, limit=3))
                     print("Updated Latest Articles in index.html")
                     break
         
-        write_file(INDEX_PATH, str(index_soup))
+        pending_writes.append(writer.submit(write_file, INDEX_PATH, index_soup.encode('utf-8')))
         
     # Update blog/index.html if it exists
     blog_index_path = os.path.join(BLOG_DIR, 'index.html')
     if os.path.exists(blog_index_path):
         print("Updating blog/index.html...")
         blog_index_content = read_file(blog_index_path)
-        blog_index_soup = BeautifulSoup(blog_index_content, 'html.parser')
+        blog_index_soup = parse_html(blog_index_content)
         
         # --- Update JSON-LD for Breadcrumb & ItemList ---
         json_ld_tag = blog_index_soup.find('script', type='application/ld+json')
@@ -434,23 +673,7 @@ def main():
         if 'name' not in current_data: current_data['name'] = "INS-Mai 博客"
         
         # Update Breadcrumb
-        current_data['breadcrumb'] = {
-            "@type": "BreadcrumbList",
-            "itemListElement": [
-                {
-                    "@type": "ListItem",
-                    "position": 1,
-                    "name": "首页",
-                    "item": f"{DOMAIN}/"
-                },
-                {
-                    "@type": "ListItem",
-                    "position": 2,
-                    "name": "博客",
-                    "item": f"{DOMAIN}/blog/"
-                }
-            ]
-        }
+        current_data['breadcrumb'] = breadcrumb_list("博客", f"{DOMAIN}/blog/")
         
         # Update ItemList (Article List)
         item_list_elements = []
@@ -469,53 +692,22 @@ def main():
         
         # Write back JSON-LD
         if json_ld_tag:
-            json_ld_tag.string = json.dumps(current_data, indent=2, ensure_ascii=False)
+            json_ld_tag.string = dump_json_ld(current_data)
         else:
             new_script = blog_index_soup.new_tag('script', type='application/ld+json')
-            new_script.string = json.dumps(current_data, indent=2, ensure_ascii=False)
+            new_script.string = dump_json_ld(current_data)
             if blog_index_soup.head:
                 blog_index_soup.head.append(new_script)
             else:
                 # Fallback if no head (unlikely)
                 blog_index_soup.insert(0, new_script)
 
-        updated = False
-        
-        # Try finding main > grid first
-        main_tag = blog_index_soup.find('main')
-        if main_tag:
-            grid = main_tag.find('div', class_='grid')
-            if grid:
-                 all_posts_html = get_latest_posts_html(posts, limit=100)
-                 all_posts_soup = BeautifulSoup(all_posts_html, 'html.parser')
-                 grid.clear()
-                 if all_posts_soup.body:
-                     for child in all_posts_soup.body.contents:
-                         if child.name: grid.append(copy.copy(child))
-                 else:
-                     for child in all_posts_soup.contents:
-                         if child.name: grid.append(copy.copy(child))
-                 updated = True
-                 print("Updated article list in blog/index.html (via main > grid)")
-        
-        if not updated:
-            for section in blog_index_soup.find_all('section'):
-                 h2 = section.find('h2')
-                 if h2 and ('Latest' in h2.get_text() or 'Articles' in h2.get_text()):
-                     grid = section.find('div', class_='grid')
-                     if grid:
-                         all_posts_html = get_latest_posts_html(posts, limit=100)
-                         all_posts_soup = BeautifulSoup(all_posts_html, 'html.parser')
-                         grid.clear()
-                         if all_posts_soup.body:
-                             for child in all_posts_soup.body.contents:
-                                 if child.name: grid.append(copy.copy(child))
-                         else:
-                             for child in all_posts_soup.contents:
-                                 if child.name: grid.append(copy.copy(child))
-                         updated = True
-                         print("Updated article list in blog/index.html")
-                         break
+        grid, via = find_article_grid(blog_index_soup)
+        updated = grid is not None
+        if updated:
+            grid.clear()
+            grid.extend(get_latest_post_cards(blog_index_soup, posts, limit=100))
+            print(f"Updated article list in blog/index.html{via}")
         
         if updated:
             # Also sync Nav/Footer
@@ -528,7 +720,7 @@ def main():
                  if existing_footer and footer_template: existing_footer.replace_with(copy.copy(footer_template))
                  elif footer_template: blog_index_soup.body.append(copy.copy(footer_template))
             
-            write_file(blog_index_path, str(blog_index_soup))
+            pending_writes.append(writer.submit(write_file, blog_index_path, blog_index_soup.encode('utf-8')))
             
     # Phase 4.5: Process Static Pages
     print("Phase 4.5: Processing static pages...")
@@ -565,78 +757,67 @@ def main():
 
     for page in static_pages:
         path = os.path.join(BASE_DIR, page['filename'])
-        if os.path.exists(path):
-            print(f"Updating {page['filename']}...")
+        # Just try the read: a missing page costs nothing extra, an existing one skips a stat
+        try:
             content = read_file(path)
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # 1. Sync Nav/Footer
-            if soup.body:
-                existing_nav = soup.body.find('nav')
-                if existing_nav and nav_template:
-                    existing_nav.replace_with(copy.copy(nav_template))
-                elif nav_template:
-                    soup.body.insert(0, copy.copy(nav_template))
-                    
-                existing_footer = soup.body.find('footer')
-                if existing_footer and footer_template:
-                    existing_footer.replace_with(copy.copy(footer_template))
-                elif footer_template:
-                    soup.body.append(copy.copy(footer_template))
-
-            # 2. Inject JSON-LD
-            json_ld_tag = soup.find('script', type='application/ld+json')
-            data = {}
-            
-            # Basic info
-            data['@context'] = "https://schema.org"
-            data['@type'] = page['type']
-            data['name'] = page['name']
-            data['description'] = page['desc']
-            data['url'] = f"{DOMAIN}{page['url']}"
-            data['publisher'] = {
-                "@type": "Organization",
-                "name": "INS-Mai",
-                "logo": {
-                    "@type": "ImageObject",
-                    "url": f"{DOMAIN}/favicon.svg"
-                }
-            }
-            
-            # Breadcrumb
-            data['breadcrumb'] = {
-                "@type": "BreadcrumbList",
-                "itemListElement": [
-                    {
-                        "@type": "ListItem",
-                        "position": 1,
-                        "name": "首页",
-                        "item": f"{DOMAIN}/"
-                    },
-                    {
-                        "@type": "ListItem",
-                        "position": 2,
-                        "name": page['name'],
-                        "item": f"{DOMAIN}{page['url']}"
-                    }
-                ]
+        except FileNotFoundError:
+            continue
+        print(f"Updating {page['filename']}...")
+        soup = parse_html(content)
+        
+        # 1. Sync Nav/Footer
+        if soup.body:
+            existing_nav = soup.body.find('nav')
+            if existing_nav and nav_template:
+                existing_nav.replace_with(copy.copy(nav_template))
+            elif nav_template:
+                soup.body.insert(0, copy.copy(nav_template))
+                
+            existing_footer = soup.body.find('footer')
+            if existing_footer and footer_template:
+                existing_footer.replace_with(copy.copy(footer_template))
+            elif footer_template:
+                soup.body.append(copy.copy(footer_template))
+
+        # 2. Inject JSON-LD
+        json_ld_tag = soup.find('script', type='application/ld+json')
+        data = {}
+        
+        # Basic info
+        data['@context'] = "https://schema.org"
+        data['@type'] = page['type']
+        data['name'] = page['name']
+        data['description'] = page['desc']
+        data['url'] = f"{DOMAIN}{page['url']}"
+        data['publisher'] = {
+            "@type": "Organization",
+            "name": "INS-Mai",
+            "logo": {
+                "@type": "ImageObject",
+                "url": f"{DOMAIN}/favicon.svg"
             }
+        }
+        
+        # Breadcrumb
+        data['breadcrumb'] = breadcrumb_list(page['name'], f"{DOMAIN}{page['url']}")
 
-            if json_ld_tag:
-                json_ld_tag.string = json.dumps(data, indent=2, ensure_ascii=False)
+        if json_ld_tag:
+            json_ld_tag.string = dump_json_ld(data)
+        else:
+            new_script = soup.new_tag('script', type='application/ld+json')
+            new_script.string = dump_json_ld(data)
+            if soup.head:
+                soup.head.append(new_script)
             else:
-                new_script = soup.new_tag('script', type='application/ld+json')
-                new_script.string = json.dumps(data, indent=2, ensure_ascii=False)
-                if soup.head:
-                    soup.head.append(new_script)
-                else:
-                    soup.insert(0, new_script)
-            
-            # Save
-            output_html = str(soup)
-            if not output_html.startswith('<!DOCTYPE html>'):
-                output_html = '<!DOCTYPE html>\n' + output_html
-            write_file(path, output_html)
+                soup.insert(0, new_script)
+        
+        # Save
+        pending_writes.append(writer.submit(write_file, path, *encode_page(soup)))
+
+    # Surface any write error before reporting success
+    for future in pending_writes:
+        future.result()
+    writer.shutdown()
 
     # Phase 5: Update Sitemap
     update_sitemap(posts)